@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+
+CENT = Decimal('0.01')
+HUNDRED = Decimal('100')
+
+
+@dataclass
+class EffectiveSplit:
+    expense_id: int
+    payer_id: int
+    user_id: int
+    amount: Decimal
+    is_settled: bool
+
+
+def allocate_cents(amount: Decimal,
+                   weights: dict[int, int | Decimal]) -> dict[int, Decimal]:
+    """
+    Split an amount into whole cents proportionally to the given weights
+    using the largest remainder method, so the parts always add up to the
+    exact amount. Leftover cents go to the largest remainders first, ties
+    are broken by ascending user id to keep the result deterministic.
+    """
+    total_cents = int((Decimal(amount) / CENT).to_integral_value())
+    fractions = {user_id: Fraction(weight)
+                 for user_id, weight in weights.items()}
+    total_weight = sum(fractions.values())
+
+    if total_weight <= 0:
+        raise ValueError('Split weights must add up to more than zero')
+
+    allocated: dict[int, int] = {}
+    remainders: list[tuple[Fraction, int]] = []
+
+    for user_id, weight in fractions.items():
+        exact = total_cents * weight / total_weight
+        allocated[user_id] = exact.numerator // exact.denominator
+        remainders.append((exact - allocated[user_id], user_id))
+
+    leftover = total_cents - sum(allocated.values())
+    remainders.sort(key=lambda item: (-item[0], item[1]))
+
+    for _, user_id in remainders[:leftover]:
+        allocated[user_id] += 1
+
+    return {user_id: cents * CENT for user_id, cents in allocated.items()}
+
+
+def split_spec_weights(spec: dict) -> dict[int, Decimal]:
+    """
+    Turn a split specification into a weight per user id.
+
+    Supported specifications are ``{"type": "equal", "users": [...]}``,
+    ``{"type": "shares", "shares": {user_id: weight}}`` and
+    ``{"type": "percent", "percents": {user_id: percent}}`` where the
+    percents must add up to 100 within a cent. Raises ValueError for
+    invalid specs.
+    """
+    spec_type = spec.get('type')
+
+    if spec_type == 'equal':
+        users = spec.get('users')
+        if not isinstance(users, list) or not users:
+            raise ValueError('An equal split needs a non-empty list of users')
+        try:
+            user_ids = [int(user_id) for user_id in users]
+        except (TypeError, ValueError):
+            raise ValueError('Split users must be user ids')
+        if len(user_ids) != len(set(user_ids)):
+            raise ValueError('Cannot have duplicate users in expense splits')
+        return {user_id: Decimal(1) for user_id in user_ids}
+
+    if spec_type not in ('shares', 'percent'):
+        raise ValueError(
+            "Split type must be 'equal', 'shares' or 'percent'")
+
+    key = 'shares' if spec_type == 'shares' else 'percents'
+    values = spec.get(key)
+    if not isinstance(values, dict) or not values:
+        raise ValueError(f'A {spec_type} split needs a mapping of '
+                         f'user ids to {key}')
+    try:
+        weights = {int(user_id): Decimal(str(value))
+                   for user_id, value in values.items()}
+    except (TypeError, ValueError, InvalidOperation):
+        raise ValueError(f'{key.capitalize()} must map user ids to numbers')
+    if len(weights) != len(values):
+        raise ValueError('Cannot have duplicate users in expense splits')
+    if any(not weight.is_finite() or weight < 0
+           for weight in weights.values()):
+        raise ValueError(f'{key.capitalize()} cannot be negative')
+    if not any(weights.values()):
+        raise ValueError(f'{key.capitalize()} must add up to more than zero')
+    # Allow for small rounding differences such as 3 x 33.33
+    if spec_type == 'percent' and abs(sum(weights.values()) - HUNDRED) > CENT:
+        raise ValueError('Percents must add up to 100')
+
+    return weights
+
+
+def rule_splits(expense_id: int, payer_id: int, amount: Decimal,
+                shares: dict[str, int],
+                materialized: dict[int, bool]) -> list[EffectiveSplit]:
+    """
+    Expand a rule-based expense into its effective per-user splits.
+
+    ``shares`` maps user ids (as JSON object keys) to share weights and
+    ``materialized`` maps user ids to the settlement state of the split rows
+    stored as exceptions. Without a stored row a share is settled only for
+    the payer, like the payer's own split of an explicit expense.
+    """
+    amounts = allocate_cents(
+        amount, {int(user_id): weight for user_id, weight in shares.items()}
+    )
+
+    return [
+        EffectiveSplit(
+            expense_id=expense_id,
+            payer_id=payer_id,
+            user_id=user_id,
+            amount=share,
+            is_settled=materialized.get(user_id, user_id == payer_id)
+        )
+        for user_id, share in sorted(amounts.items())
+    ]
@@ -1,5 +1,62 @@
 from api.models import Household, Expense, ExpenseSplit, User
+from algorithms.splits import EffectiveSplit, rule_splits
 from decimal import Decimal
+from django.db.models import Q
+
+
+def load_effective_splits(
+    user: User | None = None, household: Household | None = None
+) -> list[EffectiveSplit]:
+    """
+    Load the effective splits of a household or globally, restricted to the
+    splits a user owes or is owed when a user is given. Rule-based expenses
+    are expanded from their split rule over the stored exception rows.
+    """
+    explicit = ExpenseSplit.objects.filter(
+        expense__split_type=Expense.SPLIT_EXPLICIT
+    )
+    rule_expenses = Expense.objects.exclude(
+        split_type=Expense.SPLIT_EXPLICIT
+    )
+
+    if household is not None:
+        explicit = explicit.filter(expense__household=household)
+        rule_expenses = rule_expenses.filter(household=household)
+
+    if user is not None:
+        explicit = explicit.filter(Q(user=user) | Q(expense__payer=user))
+        rule_expenses = rule_expenses.filter(
+            Q(payer=user) | Q(split_shares__has_key=str(user.pk))
+        )
+
+    splits = [
+        EffectiveSplit(expense_id, payer_id, user_id, amount, is_settled)
+        for expense_id, payer_id, user_id, amount, is_settled
+        in explicit.values_list(
+            'expense_id', 'expense__payer_id', 'user_id', 'amount',
+            'is_settled'
+        )
+    ]
+
+    rules = list(rule_expenses.values_list(
+        'id', 'payer_id', 'amount', 'split_shares'
+    ))
+    if not rules:
+        return splits
+
+    materialized: dict[int, dict[int, bool]] = {}
+    for expense_id, user_id, is_settled in ExpenseSplit.objects.filter(
+        expense_id__in=[rule[0] for rule in rules]
+    ).values_list('expense_id', 'user_id', 'is_settled'):
+        materialized.setdefault(expense_id, {})[user_id] = is_settled
+
+    for expense_id, payer_id, amount, shares in rules:
+        splits.extend(rule_splits(
+            expense_id, payer_id, amount, shares or {},
+            materialized.get(expense_id, {})
+        ))
+
+    return splits
 
 
 def calculate_user_amount_paid(
@@ -20,148 +77,107 @@ def calculate_user_amount_paid(
 
 
 def calculate_user_amount_paid_self(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
     Calculate the total amount paid by a user for their own expenses
     in a household or globally
     """
-    if household is not None:
-        expenses = Expense.objects.filter(
-            household=household,
-            payer=user
-        )
-        expense_splits = ExpenseSplit.objects.filter(
-            user=user,
-            expense__in=expenses,
-            is_settled=True
-        )
-        return Decimal(sum(split.amount for split in expense_splits))
+    if splits is None:
+        splits = load_effective_splits(user, household)
 
-    expenses = Expense.objects.filter(payer=user)
-    expense_splits = ExpenseSplit.objects.filter(
-        user=user,
-        expense__in=expenses,
-        is_settled=True
-    )
-    return Decimal(sum(split.amount for split in expense_splits))
+    return Decimal(sum(
+        split.amount for split in splits
+        if split.user_id == user.pk and split.payer_id == user.pk
+        and split.is_settled
+    ))
 
 
 def calculate_user_amount_owed(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
     Calculate the total amount owed by a user in a household or globally
     """
-    if household is not None:
-        expense_splits = ExpenseSplit.objects.filter(
-            user=user,
-            expense__household=household
-        )
-        return Decimal(sum(split.amount for split in expense_splits)) \
-            - calculate_user_amount_paid_self(user, household)
+    if splits is None:
+        splits = load_effective_splits(user, household)
 
-    expense_splits = ExpenseSplit.objects.filter(
-        user=user
-    )
-    return Decimal(sum(split.amount for split in expense_splits)) \
-        - calculate_user_amount_paid_self(user)
+    return Decimal(sum(
+        split.amount for split in splits if split.user_id == user.pk
+    )) - calculate_user_amount_paid_self(user, household, splits)
 
 
 def calculate_user_amount_owed_settled(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
     Calculate the total amount owed by a user that has been settled
     in a household or globally
     """
-    if household is not None:
-        expenses = Expense.objects.filter(
-            household=household,
-            payer__isnull=False
-        ).exclude(payer=user)
-        expense_splits = ExpenseSplit.objects.filter(
-            user=user,
-            expense__in=expenses,
-            is_settled=True
-        )
-        return Decimal(sum(split.amount for split in expense_splits))
+    if splits is None:
+        splits = load_effective_splits(user, household)
 
-    expenses = Expense.objects.filter(payer__isnull=False).exclude(payer=user)
-    expense_splits = ExpenseSplit.objects.filter(
-        user=user,
-        expense__in=expenses,
-        is_settled=True
-    )
-    return Decimal(sum(split.amount for split in expense_splits))
+    return Decimal(sum(
+        split.amount for split in splits
+        if split.user_id == user.pk and split.payer_id != user.pk
+        and split.is_settled
+    ))
 
 
 def calculate_user_amount_owed_by_others(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
-    Calculate the total amount owed to a user by others in a household 
+    Calculate the total amount owed to a user by others in a household
     or globally
     """
-    if household is not None:
-        expenses = Expense.objects.filter(
-            household=household,
-            payer=user
-        )
-        expense_splits = ExpenseSplit.objects.filter(
-            expense__in=expenses
-        ).exclude(user=user)
-        return Decimal(sum(split.amount for split in expense_splits))
+    if splits is None:
+        splits = load_effective_splits(user, household)
 
-    expenses = Expense.objects.filter(payer=user)
-    expense_splits = ExpenseSplit.objects.filter(
-        expense__in=expenses
-    ).exclude(user=user)
-    return Decimal(sum(split.amount for split in expense_splits))
+    return Decimal(sum(
+        split.amount for split in splits
+        if split.payer_id == user.pk and split.user_id != user.pk
+    ))
 
 
 def calculate_user_amount_owed_by_others_settled(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
     Calculate the total amount owed to a user by others that has been settled
     in a household or globally
     """
-    if household is not None:
-        expenses = Expense.objects.filter(
-            household=household,
-            payer=user
-        )
-        expense_splits = ExpenseSplit.objects.filter(
-            expense__in=expenses,
-            is_settled=True
-        )
-        return Decimal(sum(split.amount for split in expense_splits)) \
-            - calculate_user_amount_paid_self(user, household)
+    if splits is None:
+        splits = load_effective_splits(user, household)
 
-    expenses = Expense.objects.filter(payer=user)
-    expense_splits = ExpenseSplit.objects.filter(
-        expense__in=expenses,
-        is_settled=True
-    )
-    return Decimal(sum(split.amount for split in expense_splits)) \
-        - calculate_user_amount_paid_self(user)
+    return Decimal(sum(
+        split.amount for split in splits
+        if split.payer_id == user.pk and split.is_settled
+    )) - calculate_user_amount_paid_self(user, household, splits)
 
 
 def calculate_user_net_balance(
-    user: User, household: Household | None = None
+    user: User, household: Household | None = None,
+    splits: list[EffectiveSplit] | None = None
 ) -> Decimal:
     """
     Calculate the net balance of a user in a household or globally
     """
-    amount_paid = calculate_user_amount_paid(user, household)
-    amount_paid_self = calculate_user_amount_paid_self(user, household)
-    amount_owed = calculate_user_amount_owed(user, household)
-    amount_owed_settled = calculate_user_amount_owed_settled(user, household)
+    if splits is None:
+        splits = load_effective_splits(user, household)
+
+    amount_owed = calculate_user_amount_owed(user, household, splits)
+    amount_owed_settled = calculate_user_amount_owed_settled(
+        user, household, splits)
     amount_owed_by_others = calculate_user_amount_owed_by_others(
-        user, household)
+        user, household, splits)
     amount_owed_by_others_settled = calculate_user_amount_owed_by_others_settled(
-        user, household)
+        user, household, splits)
 
     net_balance = (
         - amount_owed
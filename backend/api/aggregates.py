@@ -0,0 +1,54 @@
+"""
+Concurrent evaluation of independent aggregate queries.
+
+Django's async ORM hands every query to the same thread, so awaiting several
+at once does not overlap them. ``gather_aggregates`` runs them on a bounded
+pool of ``AGGREGATE_WORKERS`` threads instead, each with its own database
+connection. Connections are recycled as at the end of a request, set
+``CONN_MAX_AGE`` to keep them open between calls.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+@cache
+def get_executor(workers):
+    return ThreadPoolExecutor(max_workers=workers,
+                              thread_name_prefix='aggregates')
+
+
+def call_with_connection(func):
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+def in_transaction():
+    return connection.in_atomic_block
+
+
+async def gather_aggregates(*funcs):
+    """
+    Call the functions concurrently on the worker pool and return their
+    results in order. They are called one after another on the request's
+    connection instead when the pool is disabled, or inside a transaction
+    whose uncommitted writes other connections would not see, such as an
+    atomic batch.
+    """
+    workers = settings.AGGREGATE_WORKERS
+    if not workers or await sync_to_async(in_transaction)():
+        return [await sync_to_async(func)() for func in funcs]
+
+    executor = get_executor(workers)
+    return await asyncio.gather(*(
+        sync_to_async(call_with_connection, thread_sensitive=False,
+                      executor=executor)(func)
+        for func in funcs
+    ))
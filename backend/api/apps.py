@@ -1,6 +1,34 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def install_search_index(sender, using, **kwargs):
+    from .search import ensure_search_index
+    ensure_search_index(using)
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        post_migrate.connect(install_search_index, sender=self)
+
+        from .versions import connect_signals
+        connect_signals()
+
+        from .models import Membership, User
+        from .permissions import forget_memberships
+        post_save.connect(forget_memberships, sender=Membership)
+        post_delete.connect(forget_memberships, sender=Membership)
+
+        from .events import publish_on_commit
+        from .models.household_change import changes_recorded
+        changes_recorded.connect(publish_on_commit)
+
+        from .authentication import forget_user
+        post_save.connect(forget_user, sender=User)
+        post_delete.connect(forget_user, sender=User)
+
+        # Registers the OpenAPI extensions
+        from . import schema  # noqa: F401
@@ -0,0 +1,132 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User
+
+# Signed into access tokens by TokenObtainPairSerializer
+TOKEN_USER_CLAIMS = ('username', 'email')
+
+
+class UserCache:
+    """
+    Thread-safe LRU cache of users by id, local to the process. Entries
+    expire after ``timeout`` seconds so that changes made by other
+    processes are picked up.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.users = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.users[user_id]
+                return None
+            self.users.move_to_end(user_id)
+        # Requests must not share one mutable instance
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.users[user_id] = (user, time.monotonic() + self.timeout)
+            self.users.move_to_end(user_id)
+            while len(self.users) > self.maxsize:
+                self.users.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE,
+                       settings.USER_CACHE_TIMEOUT)
+
+
+def forget_user(sender, instance, **kwargs):
+    user_cache.discard(instance.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without a user query on most requests.
+
+    Read requests get a ``User`` built from the signed token claims with
+    every other field deferred, so a field outside the claims is loaded
+    from the database on first access only. The claims are as of the last
+    token refresh, views that return the user's profile load it from the
+    database. As with simplejwt's stateless authentication, deactivating a
+    user or changing their password only locks them out of reads once
+    their access token expires.
+
+    Write requests get the full user, checked like ``JWTAuthentication``
+    does, from a small LRU cache that is cleared for a user whenever they
+    are saved or deleted.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            user = self.get_token_user(validated_token)
+            if user is not None:
+                return user, validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_token_user(self, validated_token):
+        """
+        Build the user from the token claims, or return ``None`` for tokens
+        issued without them.
+        """
+        try:
+            claims = {api_settings.USER_ID_FIELD:
+                      validated_token[api_settings.USER_ID_CLAIM]}
+            for claim in TOKEN_USER_CLAIMS:
+                claims[claim] = validated_token[claim]
+        except KeyError:
+            return None
+
+        # from_db() takes the values in field order, the rest is deferred
+        field_names = [field.attname for field in User._meta.concrete_fields
+                       if field.attname in claims]
+        return User.from_db(router.db_for_read(User), field_names,
+                            [claims[name] for name in field_names])
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id)
+        if user is None:
+            # Looks the user up and checks that they are active
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, copy.copy(user))
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.",
+                code='password_changed'
+            )
+        return user
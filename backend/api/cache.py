@@ -0,0 +1,74 @@
+"""
+Cache of rendered responses for household-scoped GET endpoints.
+
+Entries are keyed by the request's household ETag, which already covers
+the user, the household and its version, the path with its query string
+and the Accept header. Writes bump the household version, so outdated
+entries are never looked up again and simply expire, no keys have to be
+scanned or deleted. Any cache backend works, including ``LocMemCache``
+and ``FileBasedCache``.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework import status
+
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def entry_key(etag):
+    return 'response-cache:' + etag.strip('"')
+
+
+def count(key, cache=None):
+    if cache is None:
+        cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted in between
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_response(etag):
+    """Return the cached response for the ETag, or ``None`` on a miss."""
+    entry = get_cache().get(entry_key(etag))
+    count(MISSES_KEY if entry is None else HITS_KEY)
+    if entry is None:
+        return None
+    content, content_type = entry
+    return HttpResponse(content, content_type=content_type)
+
+
+def cache_response(etag, response):
+    """Store the response under the ETag once it has been rendered."""
+    def store(response):
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(
+                entry_key(etag),
+                (response.content, response['Content-Type']),
+                settings.RESPONSE_CACHE_TIMEOUT
+            )
+    response.add_post_render_callback(store)
+
+
+def response_cache_stats():
+    """
+    Hits and misses since the counters were last evicted. With
+    ``LocMemCache`` they are per process.
+    """
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+    }
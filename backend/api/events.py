@@ -0,0 +1,162 @@
+"""
+Live household change events.
+
+Every entry appended to a household's change log is published as an event
+once its transaction commits, and streamed to the household's members by
+``api.views.events``. Events carry the change's type, object id and
+version, which is the change's sequence in the log.
+
+Publishing goes through the backend named by ``EVENTS_BACKEND``.
+``InProcessBackend`` only reaches subscribers in the publishing process,
+``ChangeLogBackend`` polls the change log and so also works across several
+workers. Other backends, such as one on a message broker's pub/sub, need
+``publish()`` and ``subscribe()`` with the same signatures.
+"""
+import asyncio
+import threading
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import HouseholdChange
+
+
+def change_event(change):
+    return {
+        'type': change.kind,
+        'id': change.object_id,
+        'version': change.sequence,
+        'deleted': change.deleted,
+    }
+
+
+def read_events(household_id, version, limit=None):
+    """Return the household's events after ``version`` from its change log."""
+    changes = HouseholdChange.objects.filter(
+        household_id=household_id,
+        sequence__gt=version
+    ).order_by('sequence')
+    return [change_event(change) for change in changes[:limit]]
+
+
+class InProcessSubscription:
+    def __init__(self, backend, household_id):
+        self.backend = backend
+        self.household_id = household_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, events):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """
+        Return the next list of events, an empty list if none arrive within
+        ``timeout`` seconds, or ``None`` if events were dropped because the
+        subscriber fell behind. The dropped events can be read from the
+        change log.
+        """
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessBackend:
+    """Broadcasts events to the subscribers in this process."""
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+
+    def publish(self, household_id, events):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(household_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, events)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, household_id, version):
+        subscription = InProcessSubscription(self, household_id)
+        with self.lock:
+            self.subscriptions.setdefault(household_id, set()).add(
+                subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.household_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.household_id]
+
+
+class ChangeLogSubscription:
+    def __init__(self, household_id, version):
+        self.household_id = household_id
+        self.version = version
+
+    async def get(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            events = await sync_to_async(read_events)(
+                self.household_id, self.version, settings.EVENTS_QUEUE_SIZE)
+            if events:
+                self.version = events[-1]['version']
+                return events
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            await asyncio.sleep(
+                min(settings.EVENTS_POLL_INTERVAL, remaining))
+
+    def close(self):
+        pass
+
+
+class ChangeLogBackend:
+    """
+    Reads events from the change log every ``EVENTS_POLL_INTERVAL``
+    seconds, so that subscribers see changes made by any process.
+    """
+
+    def publish(self, household_id, events):
+        # Already in the change log
+        pass
+
+    def subscribe(self, household_id, version):
+        return ChangeLogSubscription(household_id, version)
+
+
+@lru_cache(maxsize=None)
+def get_broadcaster():
+    return import_string(settings.EVENTS_BACKEND)()
+
+
+def publish_on_commit(sender, household_id, changes, using, **kwargs):
+    events = [change_event(change) for change in changes]
+    transaction.on_commit(
+        lambda: get_broadcaster().publish(household_id, events),
+        using=using)
@@ -0,0 +1,93 @@
+"""
+Idempotency-Key support for POST endpoints that must not run twice.
+
+The first response to a request carrying the header is stored with the
+user, the key and a hash of the request, and replayed when the same request
+is retried with the same key until the key expires. The key is claimed
+before the view runs, in the same transaction, so a concurrent duplicate
+waits for the first request to finish and then gets its response.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+IDEMPOTENCY_PARAMETERS = [
+    OpenApiParameter(
+        IDEMPOTENCY_KEY_HEADER, str, OpenApiParameter.HEADER,
+        description='Unique key of this request. Retries with the same key '
+                    'and body get the first response back.'),
+]
+
+
+def get_request_hash(request):
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.get_full_path().encode(),
+                 request.body):
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def replay(record, request_hash):
+    if record.request_hash != request_hash:
+        return Response(
+            {'detail': f'{IDEMPOTENCY_KEY_HEADER} was already used for a '
+                       f'different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    return Response(record.response_data, status=record.status_code,
+                    headers={'Idempotent-Replayed': 'true'})
+
+
+def idempotent(view):
+    """
+    Decorate a POST handler to honour the ``Idempotency-Key`` header. Only
+    responses with a status below 500 are stored. Server errors roll back
+    the view's transaction along with the key, so the request can be
+    retried. Use ``method_decorator`` for class-based views.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response(
+                {'detail': f'{IDEMPOTENCY_KEY_HEADER} is too long'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = get_request_hash(request)
+        now = timezone.now()
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(expires_at__lte=now).delete()
+            try:
+                with transaction.atomic():
+                    # Blocks while a concurrent request holds the key
+                    record = IdempotencyKey.objects.create(
+                        user=request.user, key=key, request_hash=request_hash,
+                        expires_at=now + timedelta(
+                            seconds=settings.IDEMPOTENCY_KEY_TIMEOUT))
+            except IntegrityError:
+                return replay(IdempotencyKey.objects.get(
+                    user=request.user, key=key), request_hash)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+                return response
+
+            record.status_code = response.status_code
+            record.response_data = getattr(response, 'data', None)
+            record.save(update_fields=['status_code', 'response_data'])
+        return response
+    return wrapped
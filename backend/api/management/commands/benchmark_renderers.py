@@ -0,0 +1,65 @@
+import statistics
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the render time of FastJSONRenderer and DRF\'s JSONRenderer '
+        'on expense list rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def build_rows(self, count):
+        """Rows shaped like ExpenseListSerializer output"""
+        created_at = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        users = [
+            {'id': user_id, 'username': f'user{user_id}',
+             'email': f'user{user_id}@example.com', 'profile_picture': None}
+            for user_id in range(1, 5)
+        ]
+        return [
+            {
+                'id': index,
+                'name': f'Expense {index}',
+                'description': None if index % 2 else 'Weekly groceries',
+                'amount': Decimal('42.50'),
+                'author': users[index % 4],
+                'payer': users[(index + 1) % 4],
+                'created_at': created_at + timedelta(minutes=index),
+                'unsettled_amount': Decimal('31.88'),
+                'is_fully_settled': False,
+                'splits_count': 4,
+                'total_settled': Decimal('10.62'),
+            }
+            for index in range(count)
+        ]
+
+    def time_render(self, renderer, data, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            renderer.render(data)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write('orjson is not installed, FastJSONRenderer '
+                              'falls back to JSONRenderer')
+
+        data = self.build_rows(options['rows'])
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            elapsed = self.time_render(renderer, data, options['repeat'])
+            self.stdout.write(
+                f'{type(renderer).__name__}: {elapsed:.1f} ms median for '
+                f'{options["rows"]} rows')
@@ -0,0 +1,132 @@
+import statistics
+import time
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Expense, ExpenseSplit, Household, Membership, User
+from api.views import HouseholdExpenseSummaryView, UserExpenseSummaryView
+
+# The repeated requests must not be throttled
+UNLIMITED_BUCKETS = {
+    scope: {'capacity': 10 ** 9, 'refill_rate': 10 ** 9}
+    for scope in ('user', 'household')
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the response time of the expense summaries with their '
+        'aggregates run on the worker pool and one after another, on a '
+        'household created in the database for the run and deleted after'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--expenses', type=int, default=5000)
+        parser.add_argument('--members', type=int, default=4)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--repeat', type=int, default=15)
+        parser.add_argument(
+            '--latency', type=float, default=0,
+            help='Milliseconds added to every query, as the round trip to '
+                 'a database server would')
+
+    def create_household(self, expenses, members):
+        """Half the expenses split explicitly, half by an equal rule"""
+        users = [
+            User.objects.create_user(
+                email=f'benchmark{index}@example.com',
+                username=f'benchmark{index}')
+            for index in range(members)
+        ]
+        household = Household.objects.create(name='Benchmark',
+                                             owner=users[0])
+        Membership.objects.bulk_create(
+            Membership(user=user, household=household, is_active=True)
+            for user in users
+        )
+        shares = {str(user.pk): 1 for user in users}
+        rows = Expense.objects.bulk_create(
+            Expense(
+                household=household, name=f'Expense {index}',
+                amount=Decimal('40.00'), author=users[index % members],
+                payer=users[index % members],
+                **({} if index % 2 else {
+                    'split_type': Expense.SPLIT_EQUAL,
+                    'split_shares': shares,
+                })
+            )
+            for index in range(expenses)
+        )
+        ExpenseSplit.objects.bulk_create(
+            ExpenseSplit(expense=expense, user=user,
+                         amount=Decimal('40.00') / members,
+                         is_settled=expense.pk % 3 == 0)
+            for expense in rows if expense.split_type == Expense.SPLIT_EXPLICIT
+            for user in users
+        )
+        return users
+
+    def time_request(self, view, path, user, repeat, **kwargs):
+        factory = APIRequestFactory()
+        view = async_to_sync(view)
+        timings = []
+        # The first request opens the connections
+        for _ in range(repeat + 1):
+            request = factory.get(path)
+            force_authenticate(request, user)
+            start = time.perf_counter()
+            response = view(request, **kwargs)
+            response.render()
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.content
+        return statistics.median(timings[1:]) * 1000
+
+    def delay_queries(self, latency):
+        """Sleep, which releases the GIL as network I/O does, per query"""
+        def wrapper(execute, sql, params, many, context):
+            time.sleep(latency / 1000)
+            return execute(sql, params, many, context)
+
+        def add_wrapper(sender, connection, **kwargs):
+            # Connections are reopened after their requests
+            if wrapper not in connection.execute_wrappers:
+                connection.execute_wrappers.append(wrapper)
+
+        # Worker threads connect on their own
+        connection_created.connect(add_wrapper, weak=False)
+        for connection in connections.all(initialized_only=True):
+            add_wrapper(None, connection)
+
+    def handle(self, *args, **options):
+        users = self.create_household(options['expenses'],
+                                      options['members'])
+        if options['latency']:
+            self.delay_queries(options['latency'])
+        owner = users[0]
+        household_id = owner.owned_households.get().pk
+        summaries = [
+            ('User summary', UserExpenseSummaryView.as_view(),
+             '/api/expenses/summary/', {}),
+            ('Household summary', HouseholdExpenseSummaryView.as_view(),
+             f'/api/households/{household_id}/expenses/summary/',
+             {'household_id': household_id}),
+        ]
+        try:
+            for label, view, path, kwargs in summaries:
+                for workers in (0, options['workers']):
+                    with override_settings(AGGREGATE_WORKERS=workers,
+                                           THROTTLE_BUCKETS=UNLIMITED_BUCKETS):
+                        elapsed = self.time_request(
+                            view, path, owner, options['repeat'], **kwargs)
+                    self.stdout.write(
+                        f'{label}, {workers} workers: {elapsed:.1f} ms '
+                        f'median for {options["expenses"]} expenses, '
+                        f'{options["latency"]:g} ms per query')
+        finally:
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
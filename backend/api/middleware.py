@@ -0,0 +1,52 @@
+import re
+
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compresses responses of at least ``min_length`` bytes, with brotli when
+    the client accepts it and the package is installed, otherwise with
+    gzip. Streaming responses, such as exports, are always gzipped, except
+    for event streams.
+    """
+    min_length = 1024
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        # Compressors buffer their output, which would hold back events
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+
+        # Small payloads are not worth the CPU on either end
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (brotli is None or response.streaming
+                or response.has_header('Content-Encoding')
+                or not re_accepts_brotli.search(accept_encoding)):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(
+            response.content, quality=self.brotli_quality)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # Like GZipMiddleware, a strong ETag no longer matches the bytes
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
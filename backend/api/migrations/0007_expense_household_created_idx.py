@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_alter_expensesplit_options_shoppinglistitem'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['household', 'created_at', 'id'], name='expense_household_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_expense_household_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['household', 'amount'], name='expense_household_amount_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:04
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_settlement_state(apps, schema_editor):
+    Expense = apps.get_model('api', 'Expense')
+    ExpenseSplit = apps.get_model('api', 'ExpenseSplit')
+
+    unsettled_splits = ExpenseSplit.objects.filter(
+        expense=OuterRef('pk'),
+        is_settled=False
+    )
+    unsettled_total = unsettled_splits.order_by().values(
+        'expense'
+    ).annotate(total=Sum('amount')).values('total')
+
+    Expense.objects.update(
+        unsettled_amount=Coalesce(
+            Subquery(unsettled_total),
+            Value(Decimal('0.00')),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2)
+        ),
+        is_fully_settled=~Exists(unsettled_splits)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_expense_household_amount_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='is_fully_settled',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='unsettled_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=10),
+        ),
+        migrations.RunPython(backfill_settlement_state,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['household', 'is_fully_settled', 'created_at', 'id'], name='expense_household_settled_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['household', 'unsettled_amount'], name='expense_household_owed_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_expense_settlement_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='split_shares',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='split_type',
+            field=models.CharField(choices=[('explicit', 'Explicit'), ('equal', 'Equal'), ('shares', 'Shares')], default='explicit', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_expense_split_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='household',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
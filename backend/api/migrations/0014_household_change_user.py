@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='householdchange',
+            name='kind',
+            field=models.CharField(choices=[('expense', 'Expense'), ('category', 'Expense category'), ('task', 'Task'), ('shopping_item', 'Shopping list item'), ('membership', 'Membership'), ('user', 'User')], max_length=20),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from .user import User
 from .household import Household
+from .household_change import HouseholdChange
 from .membership import Membership
 from .expense import Expense
 from .expense_split import ExpenseSplit
 from .expense_category import ExpenseCategory
 from .task import Task
 from .shopping_list_item import ShoppingListItem
+from .idempotency_key import IdempotencyKey
@@ -1,10 +1,117 @@
+from collections import defaultdict
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
 
+from algorithms.splits import EffectiveSplit, rule_splits
 from .user import User
 from .household import Household
+from .household_change import HouseholdChange
+
+
+class ExpenseQuerySet(models.QuerySet):
+    def refresh_settlement_state(self):
+        """
+        Recompute the denormalized settlement fields of every expense in the
+        queryset from its splits. Explicit expenses are updated in a single
+        UPDATE, rule-based ones are expanded in Python and bulk updated.
+        Must be called after changing splits through bulk operations that
+        bypass ``ExpenseSplit.save``, it also records the expenses as changed
+        in their households' change logs.
+        """
+        from .expense_split import ExpenseSplit
+
+        changed = defaultdict(list)
+        for household_id, pk in self.values_list('household_id', 'pk'):
+            changed[household_id].append(pk)
+        for household_id, pks in changed.items():
+            HouseholdChange.objects.record(
+                household_id, HouseholdChange.EXPENSE, pks)
+
+        unsettled_splits = ExpenseSplit.objects.filter(
+            expense=OuterRef('pk'),
+            is_settled=False
+        )
+        unsettled_total = unsettled_splits.order_by().values(
+            'expense'
+        ).annotate(total=Sum('amount')).values('total')
+
+        updated = self.filter(split_type=Expense.SPLIT_EXPLICIT).update(
+            unsettled_amount=Coalesce(
+                Subquery(unsettled_total),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=10,
+                                                 decimal_places=2)
+            ),
+            is_fully_settled=~Exists(unsettled_splits),
+            updated_at=Now()
+        )
+
+        rule_expenses = list(self.exclude(
+            split_type=Expense.SPLIT_EXPLICIT
+        ).prefetch_related('splits'))
+        if rule_expenses:
+            now = timezone.now()
+            for expense in rule_expenses:
+                unsettled = [split.amount
+                             for split in expense.effective_split_states()
+                             if not split.is_settled]
+                expense.unsettled_amount = sum(unsettled, Decimal('0.00'))
+                expense.is_fully_settled = not unsettled
+                expense.updated_at = now
+            Expense.objects.bulk_update(
+                rule_expenses,
+                ['unsettled_amount', 'is_fully_settled', 'updated_at'])
+
+        return updated + len(rule_expenses)
+
+    def settle_rule_splits(self, user):
+        """
+        Settle the user's share of every rule-based expense in the queryset
+        by materializing it as a settled split row. Returns the number of
+        shares that were not settled before.
+        """
+        from .expense_split import ExpenseSplit
+
+        rule_expenses = list(self.exclude(
+            split_type=Expense.SPLIT_EXPLICIT
+        ).filter(
+            split_shares__has_key=str(user.pk)
+        ).prefetch_related('splits'))
+
+        settled = []
+        for expense in rule_expenses:
+            for split in expense.effective_split_states():
+                if split.user_id == user.pk and not split.is_settled:
+                    settled.append(ExpenseSplit(
+                        expense=expense,
+                        user=user,
+                        amount=split.amount,
+                        is_settled=True
+                    ))
+
+        ExpenseSplit.objects.bulk_create(
+            settled,
+            update_conflicts=True,
+            unique_fields=['expense', 'user'],
+            update_fields=['amount', 'is_settled', 'updated_at']
+        )
+        return len(settled)
 
 
 class Expense(models.Model):
+    SPLIT_EXPLICIT = 'explicit'
+    SPLIT_EQUAL = 'equal'
+    SPLIT_SHARES = 'shares'
+    SPLIT_TYPES = [
+        (SPLIT_EXPLICIT, 'Explicit'),
+        (SPLIT_EQUAL, 'Equal'),
+        (SPLIT_SHARES, 'Shares'),
+    ]
+
     household = models.ForeignKey(Household, on_delete=models.CASCADE,
                                   related_name='expenses')
     category = models.ForeignKey('ExpenseCategory', on_delete=models.SET_NULL,
@@ -17,9 +124,121 @@ class Expense(models.Model):
     payer = models.ForeignKey(User, on_delete=models.CASCADE,
                               related_name='paid_expenses')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Rule-based expenses store the member share weights here instead of one
+    # ExpenseSplit row per member, rows are only kept for exceptions such as
+    # settled shares.
+    split_type = models.CharField(max_length=10, choices=SPLIT_TYPES,
+                                  default=SPLIT_EXPLICIT)
+    split_shares = models.JSONField(blank=True, null=True)
+
+    # Denormalized from the splits, kept up to date by ExpenseSplit.save,
+    # ExpenseSplit.delete and ExpenseQuerySet.refresh_settlement_state.
+    unsettled_amount = models.DecimalField(max_digits=10, decimal_places=2,
+                                           default=Decimal('0.00'),
+                                           editable=False)
+    is_fully_settled = models.BooleanField(default=True, editable=False)
+
+    objects = ExpenseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination key for household expense listings.
+            models.Index(fields=['household', 'created_at', 'id'],
+                         name='expense_household_created_idx'),
+            # Amount range filters within a household.
+            models.Index(fields=['household', 'amount'],
+                         name='expense_household_amount_idx'),
+            # Settlement status filters and sorting within a household.
+            models.Index(fields=['household', 'is_fully_settled',
+                                 'created_at', 'id'],
+                         name='expense_household_settled_idx'),
+            models.Index(fields=['household', 'unsettled_amount'],
+                         name='expense_household_owed_idx'),
+        ]
 
     def __str__(self):
         return (
             f'{self.name} in {self.household.name} '
             f'(id: {self.id}, amount: {self.amount})'  # type: ignore
         )
+
+    @property
+    def is_rule_based(self):
+        return self.split_type != self.SPLIT_EXPLICIT
+
+    def refresh_settlement_state(self):
+        """Recompute and reload the denormalized settlement fields."""
+        Expense.objects.filter(pk=self.pk).refresh_settlement_state()
+        self.refresh_from_db(fields=['unsettled_amount', 'is_fully_settled'])
+
+    def effective_split_states(self):
+        """
+        Return the effective splits as ``EffectiveSplit`` records, expanding
+        the split rule of rule-based expenses over the stored exceptions.
+        """
+        splits = self.splits.all()  # type: ignore
+        if not self.is_rule_based:
+            return [
+                EffectiveSplit(
+                    expense_id=self.pk,
+                    payer_id=self.payer_id,  # type: ignore
+                    user_id=split.user_id,
+                    amount=split.amount,
+                    is_settled=split.is_settled
+                )
+                for split in splits
+            ]
+
+        return rule_splits(
+            self.pk, self.payer_id, self.amount,  # type: ignore
+            self.split_shares or {},
+            {split.user_id: split.is_settled for split in splits}
+        )
+
+    def effective_splits(self):
+        """
+        Return the effective splits as ``ExpenseSplit`` instances for
+        serialization. Shares of rule-based expenses without a stored row
+        are returned as unsaved instances.
+        """
+        if not self.is_rule_based:
+            return self.splits.all()  # type: ignore
+
+        from .expense_split import ExpenseSplit
+
+        stored = {split.user_id: split for split in self.splits.all()}
+        states = self.effective_split_states()
+        users = User.objects.in_bulk(
+            [state.user_id for state in states if state.user_id not in stored]
+        )
+
+        splits = []
+        for state in states:
+            split = stored.get(state.user_id)
+            if split is None:
+                split = ExpenseSplit(expense=self, user=users[state.user_id],
+                                     is_settled=state.is_settled)
+            split.amount = state.amount
+            splits.append(split)
+        return splits
+
+    def sync_rule_splits(self):
+        """
+        Bring the stored exception rows of a rule-based expense in line with
+        its rule after the rule, amount or payer changed. Settled shares of
+        current members are kept while their amount is unchanged. A share
+        whose amount changed is reopened, as what was paid for it no longer
+        covers it, so all other rows are dropped.
+        """
+        from .expense_split import ExpenseSplit
+
+        amounts = {state.user_id: state.amount
+                   for state in self.effective_split_states()}
+        keep = [
+            split.pk for split in self.splits.all()  # type: ignore
+            if split.is_settled and amounts.get(split.user_id) == split.amount
+        ]
+        ExpenseSplit.objects.filter(expense=self).exclude(
+            pk__in=keep).delete()
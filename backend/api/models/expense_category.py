@@ -9,6 +9,7 @@ class ExpenseCategory(models.Model):
     name = models.CharField(max_length=50)
     icon = models.CharField(max_length=4)  # Unicode emoji support
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('household', 'name')
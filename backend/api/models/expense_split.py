@@ -10,11 +10,25 @@ class ExpenseSplit(models.Model):
                              related_name='expense_splits')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     is_settled = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('expense', 'user')
         verbose_name_plural = 'Expense Splits'
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Expense.objects.filter(
+            pk=self.expense_id  # type: ignore
+        ).refresh_settlement_state()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Expense.objects.filter(
+            pk=self.expense_id  # type: ignore
+        ).refresh_settlement_state()
+        return result
+
     def __str__(self):
         return (
             f'Split of {self.amount} for {self.user.username} '
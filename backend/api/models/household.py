@@ -3,6 +3,12 @@ from django.db import models
 from .user import User
 
 
+class HouseholdQuerySet(models.QuerySet):
+    def bump_version(self, by=1):
+        """Increment the change version of every household in the queryset."""
+        return self.update(version=models.F('version') + by)
+
+
 class Household(models.Model):
     name = models.CharField(max_length=100, unique=False)
     description = models.TextField(blank=True, null=True)
@@ -11,9 +17,23 @@ class Household(models.Model):
     members = models.ManyToManyField(User, through='Membership',
                                      related_name='households')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every change to the household's data, see api.versions
+    version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    objects = HouseholdQuerySet.as_manager()
 
     class Meta:
         unique_together = ('name', 'owner')
 
+    def save(self, *args, **kwargs):
+        # The version is only ever incremented in the database, never
+        # written back from a possibly stale instance
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'version'
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.name} (id: {self.id})'  # type: ignore
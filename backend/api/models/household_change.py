@@ -0,0 +1,82 @@
+from django.db import models, transaction
+from django.dispatch import Signal
+
+from .household import Household
+
+# Sent with the household id and the new entries, see api.events
+changes_recorded = Signal()
+
+
+class HouseholdChangeQuerySet(models.QuerySet):
+    def record(self, household_id, kind, object_ids, deleted=False):
+        """
+        Append a change of each object to the household's log. The entries
+        are numbered from the household's version, which is bumped once per
+        entry. The bump locks the household row until the transaction ends,
+        so sequences become visible in order and a client that has seen a
+        sequence has seen every change before it.
+        """
+        object_ids = list(object_ids)
+        if not object_ids:
+            return []
+
+        with transaction.atomic(using=self.db):
+            households = Household.objects.using(self.db).filter(
+                pk=household_id)
+            if not households.bump_version(len(object_ids)):
+                return []
+            version = households.values_list('version', flat=True).get()
+            first = version - len(object_ids) + 1
+            changes = self.bulk_create([
+                HouseholdChange(household_id=household_id,
+                                sequence=first + offset, kind=kind,
+                                object_id=object_id, deleted=deleted)
+                for offset, object_id in enumerate(object_ids)
+            ])
+            changes_recorded.send(HouseholdChange, household_id=household_id,
+                                  changes=changes, using=self.db)
+        return changes
+
+
+class HouseholdChange(models.Model):
+    """One entry of a household's change log, see api.views.changes"""
+    EXPENSE = 'expense'
+    CATEGORY = 'category'
+    TASK = 'task'
+    SHOPPING_ITEM = 'shopping_item'
+    MEMBERSHIP = 'membership'
+    # A member's profile, which the other kinds render
+    USER = 'user'
+    KINDS = [
+        (EXPENSE, 'Expense'),
+        (CATEGORY, 'Expense category'),
+        (TASK, 'Task'),
+        (SHOPPING_ITEM, 'Shopping list item'),
+        (MEMBERSHIP, 'Membership'),
+        (USER, 'User'),
+    ]
+
+    household = models.ForeignKey(Household, on_delete=models.CASCADE,
+                                  related_name='changes')
+    sequence = models.PositiveBigIntegerField()
+    kind = models.CharField(max_length=20, choices=KINDS)
+    object_id = models.PositiveBigIntegerField()
+    # Tombstone of a deleted object
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = HouseholdChangeQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # Also the index delta sync reads the log through.
+            models.UniqueConstraint(fields=['household', 'sequence'],
+                                    name='household_change_sequence_uniq'),
+        ]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return (
+            f'{self.kind} {self.object_id} {action} in household '
+            f'{self.household_id} (sequence: {self.sequence})'  # type: ignore
+        )
@@ -0,0 +1,30 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .user import User
+
+
+class IdempotencyKey(models.Model):
+    """The stored response to a request sent with an Idempotency-Key"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request's method, path and body
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_data = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'],
+                                    name='idempotency_key_user_key_uniq'),
+        ]
+        indexes = [
+            # Pruning of expired keys.
+            models.Index(fields=['expires_at'],
+                         name='idempotency_key_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.key} of {self.user_id}'  # type: ignore
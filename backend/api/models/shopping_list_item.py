@@ -17,6 +17,7 @@ class ShoppingListItem(models.Model):
     )
     is_purchased = models.BooleanField(default=False)
     added_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     purchased_at = models.DateTimeField(blank=True, null=True)
     added_by = models.ForeignKey(
         User, on_delete=models.CASCADE,
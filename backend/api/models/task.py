@@ -14,6 +14,7 @@ class Task(models.Model):
                                  related_name='added_tasks')
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return (
@@ -0,0 +1,186 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a compound ordering key such as
+    ``(created_at, id)``.
+
+    Each page is fetched with a single ``WHERE key < cursor LIMIT n + 1``
+    query, so there is no ``OFFSET`` scan and no ``COUNT(*)``. Cursors are
+    opaque base64 tokens that encode the key of the boundary row and the
+    direction of travel. All ordering fields must share one direction and
+    the last one must be unique (normally the primary key). Ordering fields
+    may also be queryset annotations such as a search rank.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = getattr(view, 'pagination_ordering', self.ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.descending = self.ordering[0].startswith('-')
+        self.page_size = self.get_page_size(request)
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        # Walking backwards flips both the comparison and the ordering,
+        # the page is reversed again once it has been fetched.
+        descending = self.descending != reverse
+        if position is not None:
+            queryset = queryset.filter(
+                self.build_keyset_filter(position, descending))
+        queryset = queryset.order_by(
+            *(('-' if descending else '') + field for field in self.fields))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def build_keyset_filter(self, position, descending):
+        """
+        Build the row-value comparison ``(f1, f2, ...) < (v1, v2, ...)``
+        as ``f1 < v1 OR (f1 = v1 AND f2 < v2) OR ...``.
+        """
+        lookup = 'lt' if descending else 'gt'
+        clauses = []
+        for index, field in enumerate(self.fields):
+            equal = {name: value for name, value in
+                     zip(self.fields[:index], position[:index])}
+            clauses.append(
+                Q(**equal, **{f'{field}__{lookup}': position[index]}))
+        return reduce(or_, clauses)
+
+    def encode_cursor(self, instance, reverse):
+        position = []
+        for field in self.fields:
+            # Pages of .values() querysets hold dicts
+            value = (instance[field] if isinstance(instance, dict)
+                     else getattr(instance, field))
+            position.append(
+                value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        payload = json.dumps({'p': position, 'r': int(reverse)},
+                             separators=(',', ':'), default=str)
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.rstrip('='))
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            raw_position = payload['p']
+            reverse = bool(payload.get('r', 0))
+            if len(raw_position) != len(self.fields):
+                raise ValueError
+            position = [
+                self.to_python(model, field, value)
+                for field, value in zip(self.fields, raw_position)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def to_python(self, model, field, value):
+        try:
+            return model._meta.get_field(field).to_python(value)
+        except FieldDoesNotExist:
+            # Annotations are stored in the cursor as plain JSON values.
+            return value
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Paged past the beginning, restart from the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Paged past the end, restart from the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True,
+                             'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque pagination cursor',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page '
+                               f'(max {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import BasePermission
+
+from .models import Household, Membership
+
+
+def get_membership_cache():
+    return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+
+def membership_cache_key(user_id):
+    return f'household-ids:{user_id}'
+
+
+def get_household_ids(user):
+    """
+    Return the ids of the households the user is a member of. The set is
+    cached for ``MEMBERSHIP_CACHE_TIMEOUT`` seconds and dropped whenever
+    one of the user's memberships changes.
+    """
+    cache = get_membership_cache()
+    key = membership_cache_key(user.pk)
+    household_ids = cache.get(key)
+    if household_ids is None:
+        household_ids = frozenset(Membership.objects.filter(
+            user=user
+        ).values_list('household_id', flat=True))
+        cache.set(key, household_ids, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return household_ids
+
+
+def is_household_member(user, household_id):
+    try:
+        household_id = int(household_id)
+    except (TypeError, ValueError):
+        return False
+    return household_id in get_household_ids(user)
+
+
+def check_household_member(user, household_id):
+    """Raise ``NotFound`` unless the user is a member of the household."""
+    if not is_household_member(user, household_id):
+        raise NotFound(IsHouseholdMember.message)
+
+
+def forget_memberships(sender, instance, **kwargs):
+    # Dropped on commit so that a concurrent request cannot cache the
+    # memberships as they were before the change
+    key = membership_cache_key(instance.user_id)
+    transaction.on_commit(lambda: get_membership_cache().delete(key))
+
+
+class IsHouseholdMember(BasePermission):
+    """
+    Allows members of the household named by the view's ``household_id``
+    URL argument, and of the household an object belongs to when the view
+    checks object permissions. Households the user is not a member of are
+    reported as not found, like households that do not exist.
+    """
+    message = 'Household not found or you do not have access'
+
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+
+        household_id = view.kwargs.get('household_id')
+        if household_id is not None:
+            check_household_member(request.user, household_id)
+        return True
+
+    def has_object_permission(self, request, view, obj):
+        check_household_member(
+            request.user,
+            obj.pk if isinstance(obj, Household) else obj.household_id)
+        return True
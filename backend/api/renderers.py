@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import re
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders a dict or a list of flat dicts as CSV.
+
+    Export views stream their rows themselves and only go through this
+    renderer for error responses, it mainly lets ``?format=csv`` pass
+    content negotiation.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        fieldnames = list(rows[0]) if rows else []
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders a list as newline-delimited JSON, one item per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(
+            json.dumps(row, cls=JSONEncoder) + '\n' for row in rows
+        ).encode(self.charset)
+
+
+# Floats orjson writes differently from repr(), e.g. 1e16 and 0.00001 for
+# 1e+16 and 1e-05. Also found in some strings, which is merely slower. Kept
+# to patterns re and bytes search fast, an alternation is several times
+# slower than the encoding itself.
+EXPONENT = re.compile(rb'e[-0-9]')
+SMALL_FLOAT = b'0.0000'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    The output is the same as DRF's: compact separators, UTF-8 instead of
+    ``\\u`` escapes, decimals as numbers, datetimes in ISO 8601 with ``Z``
+    for UTC, and lazy strings and the other types ``JSONEncoder`` knows
+    converted the same way. Indented output (as requested by the browsable
+    API) and anything orjson refuses, such as integers wider than 64 bits,
+    fall back to the stdlib encoder, as does everything when orjson is not
+    installed. So do floats below 1e-4 or from 1e16 on, which only the
+    stdlib encoder writes like ``repr()``, and NaN and infinite decimals,
+    which raise like in ``JSONRenderer``.
+
+    Unlike ``JSONRenderer``, NaN and infinite floats are rendered as
+    ``null`` rather than raising, orjson gives no way to detect them short
+    of walking the data.
+    """
+    encoder = JSONEncoder()
+
+    @classmethod
+    def default(cls, obj):
+        if isinstance(obj, Decimal):
+            if not obj.is_finite():
+                # Raised again by the stdlib encoder
+                raise TypeError('Out of range decimal')
+            return float(obj)
+        return cls.encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type or '',
+                                 renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=(
+                orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z))
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if SMALL_FLOAT in ret or EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like DRF, escape the separators that are invalid in JavaScript
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,6 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Documents ``CachedJWTAuthentication`` like simplejwt's own class"""
+    target_class = 'api.authentication.CachedJWTAuthentication'
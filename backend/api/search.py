@@ -0,0 +1,131 @@
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'api_expense_fts'
+
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON api_expense BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON api_expense BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    """,
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF name, description
+        ON api_expense BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+}
+
+# Aliases whose FTS index is known to be installed.
+_fts_ready = {}
+
+
+def ensure_search_index(using='default'):
+    """
+    Install the FTS5 index over expense names and descriptions on SQLite.
+
+    The index is an external-content FTS5 table kept in sync by triggers,
+    so bulk inserts and queryset updates are covered too. SQLite migrations
+    that remake ``api_expense`` drop its triggers, so this is run after
+    every migrate and rebuilds the index whenever a trigger is missing.
+    Returns whether full-text search is available.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{FTS_TABLE}%']
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE in existing and existing.issuperset(FTS_TRIGGERS):
+            _fts_ready[using] = True
+            return True
+
+        try:
+            for trigger in FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"name, description, "
+                f"content='api_expense', content_rowid='id')"
+            )
+            for sql in FTS_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+        except DatabaseError:
+            # SQLite was built without FTS5, fall back to icontains.
+            _fts_ready[using] = False
+            return False
+
+    _fts_ready[using] = True
+    return True
+
+
+def is_search_index_available(using='default'):
+    """Return whether the FTS5 index exists, checked once per alias."""
+    if using not in _fts_ready:
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            _fts_ready[using] = False
+        else:
+            tables = connection.introspection.table_names()
+            _fts_ready[using] = FTS_TABLE in tables
+    return _fts_ready[using]
+
+
+def search_terms(query):
+    """Split a free-text query into lowercase word terms."""
+    return re.findall(r'\w+', query.lower())
+
+
+def search_expenses(queryset, query):
+    """
+    Restrict an expense queryset to rows matching ``query``.
+
+    On SQLite with FTS5 the matches are annotated with their bm25 score as
+    ``search_rank`` (lower is better) and ``True`` is returned so the
+    caller can order by relevance. Any term may match, each term also
+    matches as a prefix. Other backends fall back to ``icontains`` lookups
+    and return ``False``.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none(), False
+
+    if is_search_index_available(queryset.db):
+        match = ' OR '.join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = api_expense.id',
+            (match,), output_field=FloatField()
+        ))
+        return queryset, True
+
+    condition = Q()
+    for term in terms:
+        condition |= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition), False
@@ -1,17 +1,33 @@
 from .user import UserSerializer
-from .household import HouseholdSerializer
+from .auth import TokenObtainPairSerializer, TokenRefreshSerializer
+from .household import (
+    HouseholdSerializer,
+    HouseholdMemberSerializer,
+    HouseholdReferenceSerializer
+)
 from .membership import MembershipSerializer
 from .expense import (
     ExpenseSerializer,
     ExpenseSplitSerializer,
-    ExpenseListSerializer
+    ExpenseListSerializer,
+    ExpenseListValuesSerializer
+)
+from .expense_import import (
+    ExpenseImportRowSerializer,
+    ExpenseImportSplitSerializer
 )
 from .expense_category import (
     ExpenseCategorySerializer,
-    ExpenseCategoryListSerializer
+    ExpenseCategoryListSerializer,
+    ExpenseCategoryListValuesSerializer
 )
 from .task import (
     TaskSerializer,
-    TaskCreateUpdateSerializer
+    TaskCreateUpdateSerializer,
+    TaskValuesSerializer
+)
+from .shopping_list_item import (
+    ShoppingListItemSerializer,
+    ShoppingListItemValuesSerializer
 )
-from .shopping_list_item import ShoppingListItemSerializer
+from .batch import BatchRequestSerializer
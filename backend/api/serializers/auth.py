@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+
+
+def set_user_claims(token, user):
+    # See api.authentication.CachedJWTAuthentication
+    token['username'] = user.username
+    token['email'] = user.email
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Signs the claims read requests authenticate with into the tokens"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_user_claims(token, user)
+        return token
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Signs the user's current claims into the new access token, rather than
+    the ones copied from the refresh token, so that profile changes reach
+    the claims on the next refresh.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = self.token_class.access_token_class(data['access'])
+        user = get_user_model().objects.get(**{
+            api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]})
+        set_user_claims(access, user)
+        data['access'] = str(access)
+        return data
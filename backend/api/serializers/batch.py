@@ -0,0 +1,21 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class BatchSubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.RegexField(
+        r'^/', max_length=2000,
+        error_messages={'invalid': 'Enter an absolute path, e.g. /api/'})
+    body = serializers.JSONField(required=False, allow_null=True)
+    headers = serializers.DictField(
+        child=serializers.CharField(), required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """Validates a batch of API requests, see api.views.batch"""
+    requests = BatchSubRequestSerializer(
+        many=True, allow_empty=False,
+        max_length=settings.BATCH_MAX_REQUESTS)
+    atomic = serializers.BooleanField(default=False)
@@ -1,15 +1,22 @@
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import serializers
-from django.db.models import Sum
+from rest_framework.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
 
+from algorithms.splits import allocate_cents, rule_splits, split_spec_weights
+from .mixins import DynamicFieldsMixin
+from .values import ValuesSerializer
 from .user import UserSerializer
-from .household import HouseholdSerializer
+from .household import HouseholdSerializer, HouseholdReferenceSerializer
 from .expense_split import ExpenseSplitSerializer
 from .expense_category import ExpenseCategoryListSerializer
-from ..models import Expense, ExpenseSplit
+from ..models import Expense, ExpenseCategory, ExpenseSplit, Membership
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
-    household = HouseholdSerializer(read_only=True)
+class ExpenseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    household = HouseholdReferenceSerializer(read_only=True)
     household_id = serializers.IntegerField(write_only=True)
     category = ExpenseCategoryListSerializer(read_only=True)
     category_id = serializers.IntegerField(
@@ -17,123 +24,342 @@ class ExpenseSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     payer = UserSerializer(read_only=True)
     payer_id = serializers.IntegerField(write_only=True)
-    splits = ExpenseSplitSerializer(many=True, read_only=True)
+    splits = ExpenseSplitSerializer(
+        source='effective_splits', many=True, read_only=True)
     splits_data = serializers.ListField(
         child=serializers.DictField(), write_only=True, required=False
     )
+    split_rule = serializers.DictField(write_only=True, required=False)
+    split_spec = serializers.DictField(write_only=True, required=False)
 
     class Meta:
         model = Expense
         fields = (
             'id', 'household', 'household_id', 'category', 'category_id',
             'name', 'description', 'amount', 'author', 'payer', 'payer_id',
-            'created_at', 'splits', 'splits_data'
+            'created_at', 'unsettled_amount', 'is_fully_settled',
+            'split_type', 'split_shares', 'splits', 'splits_data',
+            'split_rule', 'split_spec'
         )
-
-    def validate_household_id(self, value):
-        """Validate that the household exists"""
-        from ..models import Household
-        try:
-            Household.objects.get(id=value)
-        except Household.DoesNotExist:
-            raise serializers.ValidationError("Household does not exist")
-        return value
-
-    def validate_payer_id(self, value):
-        """Validate that the payer exists"""
-        from ..models import User
-        try:
-            User.objects.get(id=value)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Payer does not exist")
-        return value
+        read_only_fields = ('split_type', 'split_shares')
+        expandable_fields = {
+            'household': (HouseholdSerializer, {'read_only': True}),
+        }
 
     def validate_splits_data(self, value):
         """Validate splits data"""
         if not value:
             return value
 
-        from decimal import Decimal
-        total_split_amount = sum(
-            Decimal(str(split.get('amount', 0))) for split in value)
+        splits = []
+        for split in value:
+            try:
+                splits.append({
+                    **split,
+                    'user_id': int(split['user_id']),
+                    'amount': Decimal(str(split['amount'])),
+                })
+            except (KeyError, TypeError, ValueError, InvalidOperation):
+                raise serializers.ValidationError(
+                    "Each split needs a valid user_id and amount"
+                )
+            if 'is_settled' in split:
+                splits[-1]['is_settled'] = (
+                    serializers.BooleanField().to_internal_value(
+                        split['is_settled']))
+
+        total_split_amount = sum(split['amount'] for split in splits)
         if total_split_amount <= 0:
             raise serializers.ValidationError(
                 "Total split amount must be greater than 0"
             )
 
         # Check for duplicate users in splits
-        user_ids = [split.get('user_id')
-                    for split in value if split.get('user_id')]
+        user_ids = [split['user_id'] for split in splits]
         if len(user_ids) != len(set(user_ids)):
             raise serializers.ValidationError(
                 "Cannot have duplicate users in expense splits"
             )
 
-        return value
+        return splits
+
+    def validate_split_rule(self, value):
+        """
+        Validate a split rule, either ``{"type": "equal", "users": [...]}``
+        or ``{"type": "shares", "shares": {user_id: weight}}`` with whole
+        number weights, and normalize it to a share weight per user id.
+        """
+        if value.get('type') not in (Expense.SPLIT_EQUAL,
+                                     Expense.SPLIT_SHARES):
+            raise serializers.ValidationError(
+                "Split rule type must be 'equal' or 'shares'"
+            )
+
+        try:
+            weights = split_spec_weights(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+        if any(weight != int(weight) for weight in weights.values()):
+            raise serializers.ValidationError(
+                "Shares must be whole numbers"
+            )
+
+        return {
+            'type': value['type'],
+            'shares': {user_id: int(weight)
+                       for user_id, weight in weights.items()},
+        }
+
+    def validate_split_spec(self, value):
+        """Validate a split specification and return its user weights"""
+        try:
+            return split_spec_weights(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
 
     def validate(self, attrs):
         """Cross-field validation"""
+        if len([key for key in ('splits_data', 'split_rule', 'split_spec')
+                if attrs.get(key)]) > 1:
+            raise serializers.ValidationError(
+                "Provide only one of splits_data, split_rule or split_spec"
+            )
+
+        if 'split_spec' in attrs:
+            attrs['splits_data'] = self.allocate_split_spec(
+                attrs.pop('split_spec'),
+                attrs.get('amount', getattr(self.instance, 'amount', None))
+            )
+
         splits_data = attrs.get('splits_data', [])
         amount = attrs.get('amount')
 
         if splits_data and amount:
-            from decimal import Decimal
-            total_split_amount = sum(Decimal(str(split.get('amount', 0)))
-                                     for split in splits_data)
+            total_split_amount = sum(split['amount'] for split in splits_data)
             # Allow for small rounding differences
             if abs(total_split_amount - amount) > Decimal('0.01'):
                 raise serializers.ValidationError(
                     "Total split amount must equal the expense amount"
                 )
 
+        if {'household_id', 'payer_id', 'category_id',
+                'splits_data', 'split_rule'}.intersection(attrs):
+            self.validate_household_access(attrs)
+
         return attrs
 
+    def allocate_split_spec(self, weights, amount):
+        """
+        Allocate the expense amount over the split spec weights in whole
+        cents. The allocated splits add up to the amount exactly, users
+        allocated nothing get no split.
+        """
+        if amount is None:
+            raise serializers.ValidationError(
+                {'amount': "An amount is required to allocate the splits"})
+
+        return [
+            {'user_id': user_id, 'amount': share}
+            for user_id, share in allocate_cents(amount, weights).items()
+            if share
+        ]
+
+    def validate_household_access(self, attrs):
+        """
+        Check household membership of the requesting user, the payer and the
+        split users with a single query, and category ownership with at most
+        one more. The fetched objects replace the submitted ids so that
+        saving and serializing the expense needs no further lookups.
+        """
+        household_id = attrs.pop(
+            'household_id', getattr(self.instance, 'household_id', None))
+        memberships = Membership.objects.filter(
+            household_id=household_id
+        ).select_related('user', 'household')
+        members = {membership.user_id: membership.user
+                   for membership in memberships}
+
+        if not members:
+            raise serializers.ValidationError(
+                {'household_id': "Household does not exist"})
+
+        if self.context['request'].user.pk not in members:
+            raise PermissionDenied(
+                'You do not have permission to use this household.'
+            )
+        attrs['household'] = memberships[0].household
+
+        if 'payer_id' in attrs:
+            payer_id = attrs.pop('payer_id')
+            if payer_id not in members:
+                raise serializers.ValidationError(
+                    {'payer_id': "Payer is not a member of this household"})
+            attrs['payer'] = members[payer_id]
+
+        for split in attrs.get('splits_data') or []:
+            if split['user_id'] not in members:
+                raise serializers.ValidationError(
+                    {'splits_data': "All split users must be members of "
+                                    "this household"})
+            split['user'] = members[split['user_id']]
+
+        if 'split_rule' in attrs:
+            if not set(attrs['split_rule']['shares']).issubset(members):
+                raise serializers.ValidationError(
+                    {'split_rule': "All split users must be members of "
+                                   "this household"})
+
+        if 'category_id' in attrs:
+            category_id = attrs.pop('category_id')
+            category = None
+            if category_id is not None:
+                category = ExpenseCategory.objects.filter(
+                    id=category_id,
+                    household_id=household_id
+                ).first()
+                if category is None:
+                    raise serializers.ValidationError(
+                        {'category_id': "Category does not belong to "
+                                        "this household"})
+            attrs['category'] = category
+
+    def apply_split_rule(self, validated_data):
+        """Move a validated split rule onto the expense fields."""
+        split_rule = validated_data.pop('split_rule')
+        validated_data['split_type'] = split_rule['type']
+        validated_data['split_shares'] = {
+            str(user_id): weight
+            for user_id, weight in split_rule['shares'].items()
+        }
+        return split_rule['shares']
+
     def create(self, validated_data):
         """Create expense with splits"""
         splits_data = validated_data.pop('splits_data', [])
         validated_data['author'] = self.context['request'].user
 
-        expense = super().create(validated_data)
+        # Splits are settled as submitted, and otherwise only the payer's
+        # own, so the settlement state can be computed before anything is
+        # written.
+        payer = validated_data['payer']
+        if 'split_rule' in validated_data:
+            # Rule-based expenses store no split rows until a share settles
+            shares = self.apply_split_rule(validated_data)
+            amounts = allocate_cents(validated_data['amount'], shares)
+            unsettled = [amount for user_id, amount in amounts.items()
+                         if user_id != payer.pk]
+        else:
+            for split in splits_data:
+                split.setdefault('is_settled', split['user_id'] == payer.pk)
+            unsettled = [split['amount'] for split in splits_data
+                         if not split['is_settled']]
+        validated_data['unsettled_amount'] = sum(unsettled, Decimal('0.00'))
+        validated_data['is_fully_settled'] = not unsettled
 
-        # Create expense splits
-        for split_data in splits_data:
-            if split_data['user_id'] == validated_data['payer_id']:
-                split_data['is_settled'] = True
-
-            ExpenseSplit.objects.create(
-                expense=expense,
-                user_id=split_data['user_id'],
-                amount=split_data['amount'],
-                is_settled=split_data.get('is_settled', False)
-            )
+        with transaction.atomic():
+            expense = super().create(validated_data)
+            splits = ExpenseSplit.objects.bulk_create([
+                ExpenseSplit(
+                    expense=expense,
+                    user=split['user'],
+                    amount=split['amount'],
+                    is_settled=split['is_settled']
+                )
+                for split in splits_data
+            ])
 
+        # Serve the response's splits without querying them back
+        expense._prefetched_objects_cache = {'splits': splits}
         return expense
 
     def update(self, instance, validated_data):
         """Update expense and optionally update splits"""
         splits_data = validated_data.pop('splits_data', None)
+        was_rule_based = instance.is_rule_based
 
-        # Update expense fields
-        expense = super().update(instance, validated_data)
+        if 'split_rule' in validated_data:
+            self.apply_split_rule(validated_data)
+        elif splits_data is not None:
+            # Explicit splits replace a split rule
+            validated_data['split_type'] = Expense.SPLIT_EXPLICIT
+            validated_data['split_shares'] = None
 
-        # Update splits if provided
-        if splits_data is not None:
-            # Delete existing splits
-            instance.splits.all().delete()
+        with transaction.atomic():
+            # Update expense fields
+            expense = super().update(instance, validated_data)
 
-            # Create new splits
-            for split_data in splits_data:
-                ExpenseSplit.objects.create(
-                    expense=expense,
-                    user_id=split_data['user_id'],
-                    amount=split_data['amount'],
-                    is_settled=split_data.get('is_settled', False)
-                )
+            # Update splits if provided
+            if splits_data is not None:
+                self.update_splits(expense, splits_data)
+                if was_rule_based:
+                    expense.refresh_settlement_state()
+            elif expense.is_rule_based and {
+                    'split_type', 'amount', 'payer'}.intersection(
+                        validated_data):
+                expense.sync_rule_splits()
+                expense.refresh_settlement_state()
 
         return expense
 
+    def update_splits(self, expense, splits_data):
+        """
+        Apply the submitted splits as a diff keyed on user_id, so the cost
+        of an edit scales with the number of splits that actually change.
+        Unless is_settled is submitted, unchanged splits keep their
+        settlement state, and splits whose amount changed are reopened like
+        new ones, as what was paid no longer covers them, the same as the
+        shares of rule-based expenses, see ``Expense.sync_rule_splits``.
+        """
+        existing = {split.user_id: split for split in expense.splits.all()}
+        to_create = []
+        to_update = []
+        now = timezone.now()
 
-class ExpenseListSerializer(serializers.ModelSerializer):
+        for split_data in splits_data:
+            user_id = split_data['user_id']
+            amount = split_data['amount']
+            split = existing.pop(user_id, None)
+
+            if split is None:
+                to_create.append(ExpenseSplit(
+                    expense=expense,
+                    user=split_data['user'],
+                    amount=amount,
+                    is_settled=split_data.get(
+                        'is_settled', user_id == expense.payer_id)
+                ))
+                continue
+
+            if 'is_settled' in split_data:
+                is_settled = split_data['is_settled']
+            elif split.amount != amount:
+                is_settled = user_id == expense.payer_id
+            else:
+                is_settled = split.is_settled
+            if split.amount != amount or split.is_settled != is_settled:
+                split.amount = amount
+                split.is_settled = is_settled
+                split.updated_at = now
+                to_update.append(split)
+
+        if existing:
+            ExpenseSplit.objects.filter(
+                expense=expense,
+                user_id__in=list(existing)
+            ).delete()
+        if to_update:
+            ExpenseSplit.objects.bulk_update(
+                to_update, ['amount', 'is_settled', 'updated_at'])
+        if to_create:
+            ExpenseSplit.objects.bulk_create(to_create)
+
+        # Bulk operations bypass ExpenseSplit.save
+        if existing or to_update or to_create:
+            expense.refresh_settlement_state()
+
+
+class ExpenseListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for expense lists"""
     author = UserSerializer(read_only=True)
     payer = UserSerializer(read_only=True)
@@ -144,15 +370,54 @@ class ExpenseListSerializer(serializers.ModelSerializer):
         model = Expense
         fields = (
             'id', 'name', 'description', 'amount', 'author', 'payer',
-            'created_at', 'splits_count', 'total_settled'
+            'created_at', 'unsettled_amount', 'is_fully_settled',
+            'splits_count', 'total_settled'
         )
 
     def get_splits_count(self, obj):
         """Get the number of splits for this expense"""
-        return obj.splits.count()
+        return len(obj.effective_split_states())
 
     def get_total_settled(self, obj):
         """Get the total amount that has been settled"""
-        return obj.splits.filter(is_settled=True).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+        return sum(split.amount for split in obj.effective_split_states()
+                   if split.is_settled) or 0
+
+
+class ExpenseListValuesSerializer(ValuesSerializer):
+    """``ExpenseListSerializer`` output rendered from ``.values()`` rows"""
+    serializer_class = ExpenseListSerializer
+    extra_lookups = ('split_type', 'split_shares')
+
+    def prepare(self, rows):
+        """Load the splits of every expense in one query"""
+        stored: dict[int, list] = {}
+        for expense_id, user_id, amount, is_settled in (
+            ExpenseSplit.objects.filter(
+                expense_id__in=[row['id'] for row in rows]
+            ).values_list('expense_id', 'user_id', 'amount', 'is_settled')
+        ):
+            stored.setdefault(expense_id, []).append(
+                (user_id, amount, is_settled))
+
+        self.split_states = {}
+        for row in rows:
+            splits = stored.get(row['id'], [])
+            if row['split_type'] == Expense.SPLIT_EXPLICIT:
+                states = [(amount, is_settled)
+                          for _, amount, is_settled in splits]
+            else:
+                states = [(split.amount, split.is_settled)
+                          for split in rule_splits(
+                              row['id'], row['payer'], row['amount'],
+                              row['split_shares'] or {},
+                              {user_id: is_settled
+                               for user_id, _, is_settled in splits})]
+            self.split_states[row['id']] = states
+
+    def get_splits_count(self, row):
+        return len(self.split_states[row['id']])
+
+    def get_total_settled(self, row):
+        return sum(amount for amount, is_settled
+                   in self.split_states[row['id']] if is_settled) or 0
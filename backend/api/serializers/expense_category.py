@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .household import HouseholdSerializer
+from .values import ValuesSerializer
 from ..models import ExpenseCategory
 
 
@@ -30,3 +31,8 @@ class ExpenseCategoryListSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExpenseCategory
         fields = ('id', 'name', 'icon')
+
+
+class ExpenseCategoryListValuesSerializer(ValuesSerializer):
+    """``ExpenseCategoryListSerializer`` output rendered from ``.values()`` rows"""
+    serializer_class = ExpenseCategoryListSerializer
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from algorithms.splits import allocate_cents, split_spec_weights
+
+
+class ExpenseImportSplitSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class ExpenseImportRowSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk expense import.
+
+    All lookups are done against the ``member_ids`` and ``category_ids``
+    sets passed in the context, so validating any number of rows costs no
+    extra queries.
+    """
+    name = serializers.CharField(max_length=50)
+    description = serializers.CharField(
+        max_length=300, required=False, allow_blank=True, allow_null=True)
+    amount = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    payer_id = serializers.IntegerField()
+    category_id = serializers.IntegerField(required=False, allow_null=True)
+    splits_data = ExpenseImportSplitSerializer(many=True, required=False)
+    split_spec = serializers.DictField(required=False)
+
+    def validate_payer_id(self, value):
+        """Validate that the payer is a household member"""
+        if value not in self.context['member_ids']:
+            raise serializers.ValidationError(
+                "Payer is not a member of this household")
+        return value
+
+    def validate_category_id(self, value):
+        """Validate that the category belongs to the household"""
+        if value is not None and value not in self.context['category_ids']:
+            raise serializers.ValidationError(
+                "Category does not belong to this household")
+        return value
+
+    def validate_splits_data(self, value):
+        """Validate splits data"""
+        user_ids = [split['user_id'] for split in value]
+        if len(user_ids) != len(set(user_ids)):
+            raise serializers.ValidationError(
+                "Cannot have duplicate users in expense splits")
+
+        if any(user_id not in self.context['member_ids']
+               for user_id in user_ids):
+            raise serializers.ValidationError(
+                "All split users must be members of this household")
+
+        return value
+
+    def validate_split_spec(self, value):
+        """Validate a split specification and return its user weights"""
+        try:
+            weights = split_spec_weights(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+        if any(user_id not in self.context['member_ids']
+               for user_id in weights):
+            raise serializers.ValidationError(
+                "All split users must be members of this household")
+
+        return weights
+
+    def validate(self, attrs):
+        """Cross-field validation"""
+        if 'split_spec' in attrs:
+            if attrs.get('splits_data'):
+                raise serializers.ValidationError(
+                    "Provide either splits_data or split_spec, not both")
+            attrs['splits_data'] = [
+                {'user_id': user_id, 'amount': share}
+                for user_id, share in allocate_cents(
+                    attrs['amount'], attrs.pop('split_spec')).items()
+                if share
+            ]
+
+        splits_data = attrs.get('splits_data')
+        if splits_data:
+            total_split_amount = sum(split['amount'] for split in splits_data)
+            # Allow for small rounding differences
+            if abs(total_split_amount - attrs['amount']) > Decimal('0.01'):
+                raise serializers.ValidationError(
+                    "Total split amount must equal the expense amount")
+        return attrs
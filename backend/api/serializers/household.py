@@ -1,34 +1,77 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from .mixins import DynamicFieldsMixin
 from .user import UserSerializer
 from .task import TaskSerializer
-from ..models import Household, Membership
+from ..models import Household, Membership, Task
 
 
-class HouseholdSerializer(serializers.ModelSerializer):
+class HouseholdMemberSerializer(serializers.ModelSerializer):
+    """A household member, the user's fields plus their membership's"""
+    id = serializers.IntegerField(source='user.id', read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+    profile_picture = serializers.ImageField(source='user.profile_picture',
+                                             read_only=True)
+    membership_id = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = Membership
+        fields = ('id', 'username', 'email', 'profile_picture',
+                  'membership_id', 'joined_at', 'is_active')
+
+
+class HouseholdSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     owner = UserSerializer(read_only=True)
     members = serializers.SerializerMethodField()
-    tasks = TaskSerializer(many=True, read_only=True)
 
     class Meta:
         model = Household
         fields = ('id', 'name', 'description',
-                  'owner', 'members', 'tasks', 'created_at')
+                  'owner', 'members', 'created_at')
+        # Tasks are only included with ?expand=tasks
+        expandable_fields = {
+            'tasks': (TaskSerializer, {'many': True, 'read_only': True}),
+        }
 
-    def get_members(self, obj):
-        members = obj.members.all()
-        members_data = []
+    @staticmethod
+    def optimize_queryset(queryset, expand=()):
+        """
+        Load everything the serializer renders in a fixed number of queries,
+        regardless of the number of households, members and tasks.
+        """
+        queryset = queryset.select_related('owner').prefetch_related(
+            Prefetch(
+                'membership_set',
+                queryset=Membership.objects.select_related(
+                    'user').order_by('id')
+            )
+        )
+        if 'tasks' in expand:
+            queryset = queryset.prefetch_related(Prefetch(
+                'tasks', queryset=Task.objects.select_related('added_by')
+            ))
+        return queryset
 
-        for member in members:
-            member_data = UserSerializer(member).data
-            membership = Membership.objects.get(user=member, household=obj)
-            member_data['membership_id'] = membership.id  # type: ignore
-            member_data['joined_at'] = membership.joined_at
-            member_data['is_active'] = membership.is_active
-            members_data.append(member_data)
+    def get_members(self, obj):
+        memberships = obj.membership_set.all()
+        if 'membership_set' not in getattr(obj, '_prefetched_objects_cache',
+                                           {}):
+            memberships = memberships.select_related('user').order_by('id')
 
-        return members_data
+        return HouseholdMemberSerializer(
+            memberships, many=True, context=self.context
+        ).data
 
     def create(self, validated_data):
         validated_data['owner'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class HouseholdReferenceSerializer(serializers.ModelSerializer):
+    """Lightweight household reference for nesting in other resources"""
+
+    class Meta:
+        model = Household
+        fields = ('id', 'name')
@@ -0,0 +1,50 @@
+def parse_list_param(value):
+    """Split a comma separated query parameter into a set of names."""
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Lets clients shape read responses with ``?fields=`` and ``?expand=``.
+
+    ``fields`` limits the representation to the listed top-level fields,
+    write-only fields are unaffected so the same serializer still accepts
+    full input. ``expand`` swaps fields listed in ``Meta.expandable_fields``
+    for their full nested serializers, by default those fields are rendered
+    with the lightweight serializer declared on the class.
+
+    Both can also be passed as keyword arguments, which takes precedence
+    over the query parameters. Only serializers instantiated with the
+    request in their context or with explicit arguments are affected, so
+    nested serializers keep their full representation.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')  # type: ignore
+        query_params = getattr(request, 'query_params', {})
+        if fields is None and 'fields' in query_params:
+            fields = parse_list_param(query_params['fields'])
+        if expand is None:
+            expand = parse_list_param(query_params.get('expand'))
+
+        self.requested_fields = set(fields) if fields is not None else None
+
+        expandable = getattr(
+            self.Meta, 'expandable_fields', {})  # type: ignore
+        for name in set(expand).intersection(expandable):
+            serializer_class, serializer_kwargs = expandable[name]
+            self.fields[name] = serializer_class(  # type: ignore
+                **serializer_kwargs)
+
+    @property
+    def _readable_fields(self):
+        readable = super()._readable_fields  # type: ignore
+        if self.requested_fields is None:
+            return readable
+        return [field for field in readable
+                if field.field_name in self.requested_fields]
+
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .user import UserSerializer
+from .values import ValuesSerializer
 from ..models import ShoppingListItem
 
 
@@ -28,3 +29,8 @@ class ShoppingListItemSerializer(serializers.ModelSerializer):
         # Set the added_by field to the current user
         validated_data['added_by'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class ShoppingListItemValuesSerializer(ValuesSerializer):
+    """``ShoppingListItemSerializer`` output rendered from ``.values()`` rows"""
+    serializer_class = ShoppingListItemSerializer
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .user import UserSerializer
+from .values import ValuesSerializer
 from ..models import Task
 
 
@@ -39,3 +40,8 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
             'is_completed'
         ]
         read_only_fields = ['id']
+
+
+class TaskValuesSerializer(ValuesSerializer):
+    """``TaskSerializer`` output rendered from ``.values()`` rows"""
+    serializer_class = TaskSerializer
@@ -0,0 +1,207 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .mixins import parse_list_param
+from ..models import User
+
+
+class NestedSteps(list):
+    """The compiled steps of a nested serializer, for ``model``."""
+
+    def __init__(self, steps, model):
+        super().__init__(steps)
+        self.model = model
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path that renders ``.values()`` rows with the output of
+    an existing ``ModelSerializer``.
+
+    The readable fields of ``serializer_class`` are compiled once per class
+    into a flat list of ``(name, lookup, to_representation)`` steps, so
+    rendering a row is a dict lookup and a conversion per field, without
+    instantiating serializers, fields or model instances. Nested model
+    serializers become lookups across the relation. Method fields must be
+    provided as ``get_<name>(row)`` on the subclass, which can batch load
+    whatever they need in ``prepare(rows)``. ``?fields=`` is honoured like
+    in ``DynamicFieldsMixin``.
+
+    With ``?normalize=users`` nested users are rendered as their id and
+    collected once each into ``users``, which the view returns alongside
+    the rows.
+
+    Usage::
+
+        rows = TaskValuesSerializer.values(queryset)
+        data = TaskValuesSerializer(rows, context=context).data
+    """
+    serializer_class: type[serializers.ModelSerializer]
+    # Additional lookups for the method fields, not rendered themselves
+    extra_lookups: tuple[str, ...] = ()
+
+    _compiled: dict[type, list] = {}
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+        self.request = self.context.get('request')
+        self.timezone = timezone.get_current_timezone()
+
+        steps = self.compile()
+        query_params = getattr(self.request, 'query_params', {})
+        if 'fields' in query_params:
+            requested = parse_list_param(query_params['fields'])
+            steps = [step for step in steps if step[0] in requested]
+        self.steps = steps
+
+        self.normalize = 'users' in parse_list_param(
+            query_params.get('normalize'))
+        self.users_by_id: dict[int, dict] = {}
+
+    @classmethod
+    def compile(cls):
+        if cls not in ValuesSerializer._compiled:
+            ValuesSerializer._compiled[cls] = cls.compile_serializer(
+                cls.serializer_class())
+        return ValuesSerializer._compiled[cls]
+
+    @classmethod
+    def compile_serializer(cls, serializer, prefix=''):
+        steps = []
+        for field in serializer._readable_fields:
+            name = field.field_name
+            if isinstance(field, serializers.SerializerMethodField):
+                if prefix:
+                    raise ImproperlyConfigured(
+                        f'{cls.__name__} cannot render nested method '
+                        f'field {name!r}')
+                steps.append((name, None, getattr(cls, f'get_{name}')))
+                continue
+
+            if field.source == '*':
+                raise ImproperlyConfigured(
+                    f'{cls.__name__} cannot render field {name!r}')
+            lookup = prefix + '__'.join(field.source_attrs)
+
+            if isinstance(field, serializers.ListSerializer):
+                raise ImproperlyConfigured(
+                    f'{cls.__name__} cannot render list field {name!r}')
+            elif isinstance(field, serializers.BaseSerializer):
+                # The relation's own key tells a missing object apart
+                steps.append((name, lookup, NestedSteps(
+                    cls.compile_serializer(field, prefix=lookup + '__'),
+                    field.Meta.model)))
+            elif isinstance(field, serializers.RelatedField):
+                # Rendered as the related primary key
+                steps.append((name, lookup, None))
+            elif isinstance(field, serializers.FileField):
+                steps.append((name, lookup, cls.file_representation(field)))
+            elif cls.is_iso_datetime(field):
+                steps.append(
+                    (name, lookup, cls.datetime_representation(field)))
+            else:
+                steps.append((name, lookup, field.to_representation))
+        return steps
+
+    @staticmethod
+    def file_representation(field):
+        """Render a stored file name like FileField renders the file."""
+        storage = field.parent.Meta.model._meta.get_field(
+            field.source).storage
+
+        def to_representation(value, serializer):
+            if not value:
+                return None
+            url = storage.url(value)
+            if serializer.request is not None:
+                return serializer.request.build_absolute_uri(url)
+            return url
+        to_representation.takes_serializer = True
+        return to_representation
+
+    @staticmethod
+    def is_iso_datetime(field):
+        return (
+            isinstance(field, serializers.DateTimeField)
+            and settings.USE_TZ
+            and not hasattr(field, 'timezone')
+            and getattr(field, 'format',
+                        api_settings.DATETIME_FORMAT) == ISO_8601
+        )
+
+    @staticmethod
+    def datetime_representation(field):
+        """
+        Render like DateTimeField with ISO 8601 output, but with the current
+        timezone looked up once per render rather than once per value.
+        """
+        def to_representation(value, serializer):
+            if timezone.is_naive(value):
+                return field.to_representation(value)
+            value = value.astimezone(serializer.timezone).isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        to_representation.takes_serializer = True
+        return to_representation
+
+    @classmethod
+    def lookups(cls, steps=None):
+        lookups = []
+        for _, lookup, convert in cls.compile() if steps is None else steps:
+            if lookup is None:
+                continue
+            lookups.append(lookup)
+            if isinstance(convert, list):
+                lookups.extend(cls.lookups(convert))
+        return lookups
+
+    @classmethod
+    def values(cls, queryset, *extra):
+        """Return the queryset as ``.values()`` rows with every lookup."""
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys([*cls.lookups(), *cls.extra_lookups, *extra]))
+
+    def prepare(self, rows):
+        """Hook to batch load data for method fields."""
+
+    def render(self, row, steps):
+        data = {}
+        for name, lookup, convert in steps:
+            if lookup is None:
+                data[name] = convert(self, row)
+                continue
+
+            value = row[lookup]
+            if value is None or convert is None:
+                data[name] = value
+            elif isinstance(convert, list):
+                if self.normalize and convert.model is User:
+                    # The lookup of the relation itself holds the user id
+                    if value not in self.users_by_id:
+                        self.users_by_id[value] = self.render(row, convert)
+                    data[name] = value
+                else:
+                    data[name] = self.render(row, convert)
+            elif getattr(convert, 'takes_serializer', False):
+                data[name] = convert(value, self)
+            else:
+                data[name] = convert(value)
+        return data
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        if any(lookup is None for _, lookup, _ in self.steps):
+            self.prepare(rows)
+        return [self.render(row, self.steps) for row in rows]
+
+    @property
+    def users(self):
+        """The users referenced by the rendered rows, ordered by id."""
+        return [self.users_by_id[user_id]
+                for user_id in sorted(self.users_by_id)]
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from api.models import Household, Membership, User
+
+
+def create_user(username, **fields):
+    return User.objects.create_user(
+        email=f'{username}@example.com', username=username,
+        password='password', **fields)
+
+
+def create_household(owner, *members, name='H'):
+    """Create a household of ``owner`` and ``members``, all active."""
+    household = Household.objects.create(name=name, owner=owner)
+    for user in (owner, *members):
+        Membership.objects.create(user=user, household=household,
+                                  is_active=True)
+    return household
+
+
+class HouseholdTestCase(APITestCase):
+    """
+    A household of ``owner`` and ``member``, with ``owner`` authenticated.
+
+    Cached responses, memberships and throttle buckets are cleared between
+    tests, the rolled back database hands out the same ids again.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('a')
+        cls.member = create_user('b')
+        cls.household = create_household(cls.owner, cls.member)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.owner)
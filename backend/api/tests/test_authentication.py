@@ -0,0 +1,35 @@
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base import create_user
+
+
+class TokenClaimsTests(APITestCase):
+    """Profile changes must not be hidden by the claims of older tokens."""
+
+    def setUp(self):
+        create_user('a')
+        response = self.client.post('/api/auth/token/', {
+            'email': 'a@example.com', 'password': 'password'})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.tokens = response.json()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer ' + self.tokens['access'])
+
+    def test_profile_reflects_changes_made_after_login(self):
+        response = self.client.patch('/api/users/detail/',
+                                     {'username': 'renamed'})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = self.client.get('/api/users/detail/')
+        self.assertEqual(response.json()['username'], 'renamed')
+
+    def test_refresh_signs_current_claims(self):
+        self.client.patch('/api/users/detail/', {'username': 'renamed'})
+
+        response = self.client.post('/api/auth/token/refresh/',
+                                    {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, 200, response.content)
+        access = AccessToken(response.json()['access'])
+        self.assertEqual(access['username'], 'renamed')
+        self.assertEqual(access['email'], 'a@example.com')
@@ -0,0 +1,57 @@
+from .base import HouseholdTestCase
+
+
+class BatchTests(HouseholdTestCase):
+    def batch(self, *paths):
+        response = self.client.post('/api/batch/', {'requests': [
+            {'method': 'GET', 'path': path} for path in paths
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item['status'] for item in response.json()['responses']]
+
+    def test_api_endpoints(self):
+        self.assertEqual(
+            self.batch('/api/households/',
+                       f'/api/households/{self.household.pk}/tasks/'),
+            [200, 200])
+
+    def test_only_api_views_can_be_batched(self):
+        statuses = self.batch(
+            '/admin/',
+            '/api/schema/',
+            '/api/docs/',
+            '/api/missing/',
+            f'/api/households/{self.household.pk}/events/',
+            '/api/batch/',
+            '/api/households/',
+        )
+        self.assertEqual(statuses, [404, 404, 404, 404, 400, 400, 200])
+
+    def test_rolled_back_reads_are_not_cached(self):
+        list_path = f'/api/expenses/?household_id={self.household.pk}'
+
+        def expense(name):
+            return {'method': 'POST', 'path': '/api/expenses/', 'body': {
+                'household_id': self.household.pk, 'name': name,
+                'amount': '10.00', 'payer_id': self.owner.pk}}
+
+        response = self.client.post('/api/batch/', {'atomic': True,
+                                                    'requests': [
+            expense('Phantom'),
+            {'method': 'GET', 'path': list_path},
+            {'method': 'POST', 'path': '/api/expenses/', 'body': {}},
+        ]}, format='json')
+        responses = response.json()['responses']
+        self.assertEqual([item['status'] for item in responses],
+                         [201, 200, 400])
+        self.assertNotIn('ETag', responses[1]['headers'])
+
+        # Takes the version the rolled back batch had read
+        response = self.client.post('/api/expenses/', expense('Real')['body'],
+                                    format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # Sub-requests accept JSON, so would share this request's ETag
+        response = self.client.get(list_path, HTTP_ACCEPT='application/json')
+        self.assertEqual(
+            [item['name'] for item in response.json()['results']], ['Real'])
@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+from django.test import override_settings
+
+from api.models import Expense, ExpenseCategory, ExpenseSplit, Task
+
+from .base import HouseholdTestCase
+
+
+class HouseholdChangesTests(HouseholdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/households/{self.household.pk}/changes/'
+        self.cursor = self.sync()['cursor']
+
+    def sync(self, since=None):
+        params = {} if since is None else {'since': since}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def changes(self):
+        """Changes since the last call, advancing the cursor"""
+        changes = self.sync(self.cursor)
+        self.assertFalse(changes['has_more'])
+        self.cursor = changes['cursor']
+        return changes
+
+    def ids(self, changes, key):
+        return [item['id'] for item in changes[key]]
+
+    def create_expense(self, **fields):
+        return Expense.objects.create(
+            household=self.household, name='Dinner', amount=Decimal('10.00'),
+            author=self.owner, payer=self.owner, **fields)
+
+    def test_full_sync(self):
+        task = Task.objects.create(household=self.household, name='Dishes',
+                                   added_by=self.owner)
+        changes = self.sync()
+        self.assertEqual(self.ids(changes, 'tasks'), [task.pk])
+        self.assertEqual(sorted(self.ids(changes, 'users')),
+                         sorted([self.owner.pk, self.member.pk]))
+        self.assertEqual(changes['deleted'], [])
+
+    def test_created_updated_and_deleted(self):
+        task = Task.objects.create(household=self.household, name='Dishes',
+                                   added_by=self.owner)
+        changes = self.changes()
+        self.assertEqual(self.ids(changes, 'tasks'), [task.pk])
+        self.assertEqual(self.changes()['tasks'], [])
+
+        response = self.client.patch(f'/api/tasks/{task.pk}/',
+                                     {'is_completed': True}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        changes = self.changes()
+        self.assertEqual(self.ids(changes, 'tasks'), [task.pk])
+        self.assertTrue(changes['tasks'][0]['is_completed'])
+
+        response = self.client.delete(f'/api/tasks/{task.pk}/')
+        self.assertEqual(response.status_code, 204)
+        changes = self.changes()
+        self.assertEqual(changes['tasks'], [])
+        self.assertEqual(changes['deleted'], [{'type': 'task', 'id': task.pk}])
+
+    @override_settings(CHANGES_PAGE_SIZE=2)
+    def test_paging(self):
+        tasks = [
+            Task.objects.create(household=self.household, name=f'Task {n}',
+                                added_by=self.owner)
+            for n in range(3)
+        ]
+
+        first = self.sync(self.cursor)
+        self.assertTrue(first['has_more'])
+        second = self.sync(first['cursor'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual(self.ids(first, 'tasks') + self.ids(second, 'tasks'),
+                         [task.pk for task in tasks])
+        self.assertEqual(self.sync(second['cursor'])['cursor'],
+                         second['cursor'])
+
+    def test_deleted_expense_with_splits(self):
+        expense = self.create_expense()
+        ExpenseSplit.objects.create(expense=expense, user=self.member,
+                                    amount=Decimal('10.00'))
+        self.changes()
+
+        response = self.client.delete(f'/api/expenses/{expense.pk}/')
+        self.assertEqual(response.status_code, 204)
+        changes = self.changes()
+        self.assertEqual(changes['expenses'], [])
+        self.assertEqual(changes['deleted'],
+                         [{'type': 'expense', 'id': expense.pk}])
+
+    def test_deleted_category_unsets_expenses(self):
+        category = ExpenseCategory.objects.create(
+            household=self.household, name='Food', icon='F')
+        expense = self.create_expense(category=category)
+        updated_at = Expense.objects.get(pk=expense.pk).updated_at
+        self.changes()
+
+        response = self.client.delete(f'/api/categories/{category.pk}/')
+        self.assertEqual(response.status_code, 204)
+        changes = self.changes()
+        self.assertEqual(self.ids(changes, 'expenses'), [expense.pk])
+        self.assertIsNone(changes['expenses'][0]['category'])
+        self.assertEqual(changes['deleted'],
+                         [{'type': 'category', 'id': category.pk}])
+        self.assertGreater(Expense.objects.get(pk=expense.pk).updated_at,
+                           updated_at)
+
+    def test_removed_member(self):
+        membership = self.member.membership_set.get()
+        self.changes()
+
+        self.member.delete()
+        changes = self.changes()
+        self.assertIn({'type': 'membership', 'id': membership.pk},
+                      changes['deleted'])
+
+    def test_profile_change(self):
+        response = self.client.patch('/api/users/detail/',
+                                     {'username': 'renamed'})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        changes = self.changes()
+        self.assertEqual(changes['users'][0]['id'], self.owner.pk)
+        self.assertEqual(changes['users'][0]['username'], 'renamed')
+
+        self.owner.save(update_fields=['last_login'])
+        self.assertEqual(self.changes()['users'], [])
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+from rest_framework.test import APITransactionTestCase
+
+from api.models import Household, Membership, Task
+from api.serializers import TokenObtainPairSerializer
+
+from .base import create_household, create_user
+
+
+def get_version(household):
+    return Household.objects.values_list('version', flat=True).get(
+        pk=household.pk)
+
+
+def create_task(household, user, name):
+    return Task.objects.create(household=household, name=name,
+                               added_by=user)
+
+
+class HouseholdEventsTests(APITransactionTestCase):
+    """Events are published on commit, so the writes must be committed."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = create_user('a')
+        self.member = create_user('b')
+        self.household = create_household(self.owner, self.member)
+        self.url = f'/api/households/{self.household.pk}/events/'
+
+    async def connect(self, user, lifetime=None, **headers):
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        if lifetime is not None:
+            token.set_exp(lifetime=lifetime)
+        response = await AsyncClient().get(self.url, headers={
+            'Authorization': f'Bearer {token}', **headers})
+        self.assertEqual(response.status_code, 200)
+        return aiter(response.streaming_content)
+
+    async def read(self, stream):
+        """Return the next event, skipping keepalives"""
+        while True:
+            chunk = await asyncio.wait_for(anext(stream), 5)
+            if not chunk.startswith(b':'):
+                data = chunk.decode().split('data: ', 1)[1]
+                return json.loads(data)
+
+    async def assertClosed(self, stream):
+        try:
+            while True:
+                await asyncio.wait_for(anext(stream), 5)
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            await stream.aclose()
+        self.fail('The stream is still open')
+
+    def test_requires_asgi(self):
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+
+    async def test_non_member(self):
+        outsider = await sync_to_async(create_user)('c')
+        token = TokenObtainPairSerializer.get_token(outsider).access_token
+        response = await AsyncClient().get(self.url, headers={
+            'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_replays_from_last_event_id(self):
+        version = await sync_to_async(get_version)(self.household)
+        tasks = [
+            await sync_to_async(create_task)(self.household, self.owner,
+                                             f'Task {index}')
+            for index in range(3)
+        ]
+        stream = await self.connect(self.member,
+                                    **{'Last-Event-ID': str(version + 1)})
+        for task, expected_version in zip(tasks[1:], (version + 2,
+                                                      version + 3)):
+            event = await self.read(stream)
+            self.assertEqual(event['type'], 'task')
+            self.assertEqual(event['id'], task.pk)
+            self.assertEqual(event['version'], expected_version)
+
+        # Then live events follow
+        task = await sync_to_async(create_task)(self.household, self.owner,
+                                                'Live')
+        event = await self.read(stream)
+        self.assertEqual((event['id'], event['version']),
+                         (task.pk, version + 4))
+        await stream.aclose()
+
+    async def test_closed_on_membership_removal(self):
+        stream = await self.connect(self.member)
+        membership = await Membership.objects.aget(user=self.member)
+        await sync_to_async(membership.delete)()
+
+        event = await self.read(stream)
+        self.assertEqual(event['type'], 'membership')
+        await self.assertClosed(stream)
+
+    async def test_closed_when_token_expires(self):
+        stream = await self.connect(self.member,
+                                    lifetime=timedelta(seconds=1))
+        await self.assertClosed(stream)
+
+    @override_settings(EVENTS_KEEPALIVE=0.1)
+    async def test_closed_on_deactivation(self):
+        stream = await self.connect(self.member)
+        self.member.is_active = False
+        await sync_to_async(self.member.save)()
+        await self.assertClosed(stream)
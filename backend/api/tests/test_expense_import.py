@@ -0,0 +1,129 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.db import IntegrityError
+
+from api.models import Expense, ExpenseCategory, ExpenseSplit
+from api.views import expense_import
+
+from .base import HouseholdTestCase
+
+
+class ExpenseImportTests(HouseholdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/households/{self.household.pk}/expenses/bulk/'
+
+    def row(self, name='Dinner', **fields):
+        return {'name': name, 'amount': '30.00', 'payer_id': self.owner.pk,
+                **fields}
+
+    def read_lines(self, response):
+        content = b''.join(response.streaming_content)
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_json(self):
+        response = self.client.post(self.url, {'expenses': [
+            self.row(splits_data=[
+                {'user_id': self.owner.pk, 'amount': '10.00'},
+                {'user_id': self.member.pk, 'amount': '20.00'},
+            ]),
+            self.row('Taxi', split_spec={
+                'type': 'equal', 'users': [self.owner.pk, self.member.pk]}),
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data['created'], 2)
+
+        dinner, taxi = Expense.objects.filter(
+            pk__in=response.data['expense_ids']).order_by('pk')
+        self.assertEqual(dinner.unsettled_amount, Decimal('20.00'))
+        self.assertFalse(dinner.is_fully_settled)
+        self.assertEqual(
+            sorted(taxi.splits.values_list('user_id', 'amount', 'is_settled')),
+            [(self.owner.pk, Decimal('15.00'), True),
+             (self.member.pk, Decimal('15.00'), False)])
+
+    def test_csv(self):
+        category = ExpenseCategory.objects.create(
+            household=self.household, name='Food', icon='F')
+        body = (
+            'name,description,amount,payer_id,category_id,splits\n'
+            f'Dinner,,30.00,{self.member.pk},{category.pk},'
+            f'"{self.owner.pk}:15.00;{self.member.pk}:15.00"\n'
+            f'Taxi,To the airport,12.50,{self.owner.pk},,\n'
+        )
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, 201, response.content)
+
+        dinner, taxi = Expense.objects.filter(
+            pk__in=response.data['expense_ids']).order_by('pk')
+        self.assertEqual(dinner.category, category)
+        self.assertEqual(dinner.payer, self.member)
+        self.assertEqual(dinner.splits.count(), 2)
+        self.assertEqual(taxi.description, 'To the airport')
+        self.assertTrue(taxi.is_fully_settled)
+
+    def test_invalid_rows(self):
+        response = self.client.post(self.url, {'expenses': [
+            self.row(),
+            self.row(amount='0'),
+            self.row(),
+            self.row(splits_data=[
+                {'user_id': self.owner.pk, 'amount': '10.00'}]),
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']],
+                         [1, 3])
+        self.assertIn('amount', response.data['errors'][0]['errors'])
+        self.assertFalse(Expense.objects.exists())
+
+    def test_unreadable_body(self):
+        response = self.client.post(self.url, {'expenses': 'Dinner'},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(self.url, {'expenses': []},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.object(expense_import, 'IMPORT_BATCH_SIZE', 2)
+    def test_stream(self):
+        rows = [self.row(f'Expense {index}') for index in range(3)]
+        response = self.client.post(f'{self.url}?stream=true',
+                                    {'expenses': rows}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.read_lines(response), [
+            {'inserted': 2, 'total': 3},
+            {'inserted': 3, 'total': 3},
+            {'household_id': self.household.pk, 'created': 3},
+        ])
+        self.assertEqual(Expense.objects.count(), 3)
+
+    @mock.patch.object(expense_import, 'IMPORT_BATCH_SIZE', 1)
+    def test_stream_reports_partial_import(self):
+        bulk_create = ExpenseSplit.objects.bulk_create
+
+        def fail_second_batch(splits, **kwargs):
+            if Expense.objects.count() > 1:
+                raise IntegrityError('split rejected')
+            return bulk_create(splits, **kwargs)
+
+        rows = [
+            self.row(f'Expense {index}', splits_data=[
+                {'user_id': self.member.pk, 'amount': '30.00'}])
+            for index in range(3)
+        ]
+        with mock.patch.object(ExpenseSplit.objects, 'bulk_create',
+                               side_effect=fail_second_batch):
+            response = self.client.post(f'{self.url}?stream=true',
+                                        {'expenses': rows}, format='json')
+            lines = self.read_lines(response)
+
+        self.assertEqual(lines[0], {'inserted': 1, 'total': 3})
+        self.assertEqual(lines[1]['created'], 1)
+        self.assertIn('split rejected', lines[1]['error'])
+        self.assertEqual(len(lines), 2)
+        # The failed batch is rolled back, the first one kept
+        self.assertEqual(list(Expense.objects.values_list('name', flat=True)),
+                         ['Expense 0'])
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from api.models import Expense
+
+from .base import HouseholdTestCase
+
+
+class ExpenseListQueryPlanTests(HouseholdTestCase):
+    """The household expense list queries must be served by an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for index in range(3):
+            Expense.objects.create(
+                household=cls.household, name=f'Expense {index}',
+                amount=Decimal(index + 1), author=cls.owner, payer=cls.owner)
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/expenses/?household_id={self.household.pk}'
+
+    def explain(self, url):
+        """Return the query plan of the page query of a list request."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        sql = next(
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "api_expense"' in query['sql']
+            and 'LIMIT' in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertSearchesIndex(self, plan, index):
+        self.assertTrue(
+            any(step.startswith('SEARCH api_expense USING INDEX ' + index)
+                for step in plan), plan)
+        self.assertFalse(
+            any(step.startswith('SCAN api_expense') for step in plan), plan)
+
+    def test_first_page_uses_created_index(self):
+        plan = self.explain(self.url)
+        self.assertSearchesIndex(plan, 'expense_household_created_idx')
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_cursor_page_uses_created_index(self):
+        response = self.client.get(self.url + '&page_size=1')
+        plan = self.explain(response.json()['next'])
+        self.assertSearchesIndex(plan, 'expense_household_created_idx')
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_date_range_uses_created_index(self):
+        plan = self.explain(self.url + '&created_after=2024-01-01'
+                                       '&created_before=2100-01-01')
+        self.assertSearchesIndex(plan, 'expense_household_created_idx')
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_amount_range_uses_amount_index(self):
+        # Only the rows within the range are sorted by creation date, no
+        # index can serve both the range and the ordering.
+        plan = self.explain(self.url + '&amount_min=1.50&amount_max=2.50')
+        self.assertSearchesIndex(plan, 'expense_household_amount_idx')
@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+from api.models import Expense
+
+from .base import HouseholdTestCase
+
+
+class RuleSplitSyncTests(HouseholdTestCase):
+    """Settled shares of rule-based expenses across expense edits."""
+
+    def setUp(self):
+        super().setUp()
+        self.expense = Expense.objects.create(
+            household=self.household, name='Groceries',
+            amount=Decimal('50.00'), author=self.owner, payer=self.owner,
+            split_type=Expense.SPLIT_EQUAL,
+            split_shares={str(self.owner.pk): 1, str(self.member.pk): 1})
+        Expense.objects.filter(pk=self.expense.pk).settle_rule_splits(
+            self.member)
+        self.expense.refresh_settlement_state()
+
+    def member_share(self):
+        return next(split for split in self.expense.effective_split_states()
+                    if split.user_id == self.member.pk)
+
+    def update(self, data):
+        response = self.client.patch(f'/api/expenses/{self.expense.pk}/',
+                                     data, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.expense.refresh_from_db()
+
+    def test_settled_share_is_reopened_when_its_amount_changes(self):
+        self.assertTrue(self.member_share().is_settled)
+
+        self.update({'amount': '60.00'})
+
+        share = self.member_share()
+        self.assertEqual(share.amount, Decimal('30.00'))
+        self.assertFalse(share.is_settled)
+        self.assertEqual(self.expense.unsettled_amount, Decimal('30.00'))
+        self.assertFalse(self.expense.is_fully_settled)
+
+    def test_settled_share_is_kept_when_its_amount_is_unchanged(self):
+        self.update({'name': 'Weekly groceries', 'amount': '50.00'})
+
+        share = self.member_share()
+        self.assertEqual(share.amount, Decimal('25.00'))
+        self.assertTrue(share.is_settled)
+        self.assertTrue(self.expense.is_fully_settled)
+
+
+class ExplicitSplitSettlementTests(HouseholdTestCase):
+    """The settlement state of explicit splits as submitted."""
+
+    def create(self, member_split):
+        response = self.client.post('/api/expenses/', {
+            'household_id': self.household.pk, 'name': 'Dinner',
+            'amount': '10.00', 'payer_id': self.owner.pk,
+            'splits_data': [
+                {'user_id': self.owner.pk, 'amount': '5.00'},
+                {'user_id': self.member.pk, 'amount': '5.00',
+                 **member_split},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return Expense.objects.get(pk=response.json()['id'])
+
+    def assertSettlementState(self, expense, unsettled_amount):
+        """The denormalized state must match the stored splits."""
+        response_state = (expense.unsettled_amount, expense.is_fully_settled)
+        expense.refresh_settlement_state()
+        self.assertEqual(
+            response_state,
+            (expense.unsettled_amount, expense.is_fully_settled))
+        self.assertEqual(expense.unsettled_amount, unsettled_amount)
+
+    def test_create_with_settled_split(self):
+        expense = self.create({'is_settled': True})
+        self.assertTrue(all(split.is_settled
+                            for split in expense.splits.all()))
+        self.assertSettlementState(expense, Decimal('0.00'))
+
+        response = self.client.get(
+            f'/api/expenses/?household_id={self.household.pk}'
+            '&settled=true')
+        self.assertEqual([item['id'] for item in response.json()['results']],
+                         [expense.pk])
+
+    def test_create_with_unsettled_split(self):
+        expense = self.create({'is_settled': 'false'})
+        self.assertSettlementState(expense, Decimal('5.00'))
+        self.assertFalse(expense.is_fully_settled)
+
+    def test_create_with_invalid_settled_flag(self):
+        response = self.client.post('/api/expenses/', {
+            'household_id': self.household.pk, 'name': 'Dinner',
+            'amount': '10.00', 'payer_id': self.owner.pk,
+            'splits_data': [{'user_id': self.member.pk, 'amount': '10.00',
+                             'is_settled': 'maybe'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def update(self, expense, member_split):
+        response = self.client.patch(f'/api/expenses/{expense.pk}/', {
+            'amount': '30.00',
+            'splits_data': [
+                {'user_id': self.owner.pk, 'amount': '5.00'},
+                {'user_id': self.member.pk, **member_split},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        expense.refresh_from_db()
+        return expense.splits.get(user=self.member)
+
+    def test_settled_split_is_reopened_when_its_amount_changes(self):
+        expense = self.create({'is_settled': True})
+
+        split = self.update(expense, {'amount': '25.00'})
+        self.assertFalse(split.is_settled)
+        self.assertSettlementState(expense, Decimal('25.00'))
+        self.assertFalse(expense.is_fully_settled)
+        # The payer's own unchanged split stays settled
+        self.assertTrue(expense.splits.get(user=self.owner).is_settled)
+
+    def test_settled_split_is_kept_when_submitted(self):
+        expense = self.create({'is_settled': True})
+
+        split = self.update(expense, {'amount': '25.00', 'is_settled': True})
+        self.assertTrue(split.is_settled)
+        self.assertSettlementState(expense, Decimal('0.00'))
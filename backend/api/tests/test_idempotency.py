@@ -0,0 +1,76 @@
+from unittest import mock
+
+from api.models import Expense, IdempotencyKey
+
+from .base import HouseholdTestCase
+
+
+class IdempotencyTests(HouseholdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.settlement_url = (
+            f'/api/households/{self.household.pk}/settlement-process/')
+
+    def post(self, url, data, key='key-1'):
+        return self.client.post(url, data, format='json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def expense(self, name='Dinner'):
+        return {'household_id': self.household.pk, 'name': name,
+                'amount': '30.00', 'payer_id': self.owner.pk}
+
+    def settlement(self, amount='5.00'):
+        # Paying more than owed creates one compensating expense
+        return {'payer_id': self.owner.pk, 'payee_id': self.member.pk,
+                'amount': amount}
+
+    def test_created_expense_is_replayed(self):
+        first = self.post('/api/expenses/', self.expense())
+        self.assertEqual(first.status_code, 201, first.content)
+        self.assertNotIn('Idempotent-Replayed', first)
+
+        retry = self.post('/api/expenses/', self.expense())
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json()['id'], first.json()['id'])
+        self.assertEqual(Expense.objects.count(), 1)
+
+    def test_settlement_is_replayed(self):
+        first = self.post(self.settlement_url, self.settlement())
+        self.assertEqual(first.status_code, 200, first.content)
+
+        retry = self.post(self.settlement_url, self.settlement())
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Expense.objects.count(), 1)
+
+    def test_different_request_with_same_key(self):
+        self.post('/api/expenses/', self.expense())
+        response = self.post('/api/expenses/', self.expense('Lunch'))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Expense.objects.count(), 1)
+
+    def test_without_key(self):
+        for _ in range(2):
+            response = self.client.post('/api/expenses/', self.expense(),
+                                        format='json')
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(Expense.objects.count(), 2)
+
+    def test_key_too_long(self):
+        response = self.post('/api/expenses/', self.expense(), key='k' * 300)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Expense.objects.exists())
+
+    def test_retry_after_server_error(self):
+        with mock.patch('api.views.settlements.settle_splits_between',
+                        side_effect=RuntimeError('database went away')):
+            failed = self.post(self.settlement_url, self.settlement())
+        self.assertEqual(failed.status_code, 500)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        retry = self.post(self.settlement_url, self.settlement())
+        self.assertEqual(retry.status_code, 200, retry.content)
+        self.assertNotIn('Idempotent-Replayed', retry)
+        self.assertEqual(Expense.objects.count(), 1)
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from api.models import Expense, ExpenseCategory
+
+from .base import HouseholdTestCase
+
+
+class OwnerOnlyActionTests(HouseholdTestCase):
+    """Members lacking the rights for an action get 403, not an error."""
+
+    def setUp(self):
+        super().setUp()
+        self.expense = Expense.objects.create(
+            household=self.household, name='Dinner', amount=Decimal('10.00'),
+            author=self.owner, payer=self.owner)
+        self.category = ExpenseCategory.objects.create(
+            household=self.household, name='Food', icon='F')
+        self.client.force_authenticate(self.member)
+
+    def test_delete_expense_of_another_author(self):
+        response = self.client.delete(f'/api/expenses/{self.expense.pk}/')
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Expense.objects.filter(pk=self.expense.pk).exists())
+
+    def test_update_category_as_member(self):
+        response = self.client.patch(f'/api/categories/{self.category.pk}/',
+                                     {'name': 'Takeaway'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_delete_category_as_member(self):
+        response = self.client.delete(f'/api/categories/{self.category.pk}/')
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(
+            ExpenseCategory.objects.filter(pk=self.category.pk).exists())
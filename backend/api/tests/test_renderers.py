@@ -0,0 +1,39 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer must render what JSONRenderer renders."""
+
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+
+    def test_common_values(self):
+        self.assertSameOutput({
+            'id': 1,
+            'name': 'Caf\u00e9 \u2028',
+            'amount': Decimal('12.50'),
+            'balance': -0.1,
+            'created_at': datetime(2024, 1, 2, 3, 4, 5,
+                                   tzinfo=dt_timezone.utc),
+            'settled': True,
+            'description': None,
+            'splits': [{'user_id': 2, 'amount': 3.33}],
+        })
+
+    def test_floats_in_exponent_notation(self):
+        self.assertSameOutput([1e16, -1e16, 1.5e20, 1e-5, 9.99e-5, 1e-7,
+                               Decimal('1E+20'), 1e15, 1e-4])
+
+    def test_non_finite_decimals_raise(self):
+        for value in (Decimal('NaN'), Decimal('Infinity')):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({'amount': value})
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'amount': value})
@@ -0,0 +1,120 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+from rest_framework.test import APITransactionTestCase
+
+from api import aggregates
+from api.models import Expense, ExpenseSplit
+from api.serializers import TokenObtainPairSerializer
+
+from .base import HouseholdTestCase, create_household, create_user
+
+
+def create_expenses(owner, member, household):
+    # Paid by the owner and split between both
+    paid = Expense.objects.create(
+        household=household, name='Dinner', amount=Decimal('30.00'),
+        author=owner, payer=owner)
+    for user in (owner, member):
+        ExpenseSplit.objects.create(expense=paid, user=user,
+                                    amount=Decimal('15.00'))
+    # Owed by the owner only
+    owed = Expense.objects.create(
+        household=household, name='Taxi', amount=Decimal('10.00'),
+        author=member, payer=member)
+    ExpenseSplit.objects.create(expense=owed, user=owner,
+                                amount=Decimal('10.00'))
+
+
+class ExpenseSummaryTests(HouseholdTestCase):
+    """Inside the test's transaction the aggregates run one by one."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        create_expenses(cls.owner, cls.member, cls.household)
+
+    def test_user_summary_counts_each_expense_once(self):
+        response = self.client.get('/api/expenses/summary/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_expenses'], 2)
+
+    def test_household_summary_totals(self):
+        response = self.client.get(
+            f'/api/households/{self.household.pk}/expenses/summary/')
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()
+        self.assertEqual(summary['total_expenses'], 2)
+        self.assertEqual(Decimal(str(summary['total_amount'])),
+                         Decimal('40.00'))
+        self.assertEqual(Decimal(str(summary['user_amount_paid'])),
+                         Decimal('30.00'))
+
+    def test_non_member(self):
+        self.client.force_authenticate(create_user('c'))
+        response = self.client.get(
+            f'/api/households/{self.household.pk}/expenses/summary/')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(AGGREGATE_WORKERS=2)
+class ConcurrentSummaryTests(APITransactionTestCase):
+    """With committed data the aggregates run on the worker pool."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = create_user('a')
+        self.member = create_user('b')
+        self.household = create_household(self.owner, self.member)
+        create_expenses(self.owner, self.member, self.household)
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/households/{self.household.pk}/expenses/summary/'
+
+    def get_summaries(self):
+        """Return the summaries and how many aggregates ran on the pool."""
+        with mock.patch.object(aggregates, 'call_with_connection',
+                               wraps=aggregates.call_with_connection) as call:
+            summaries = [
+                self.client.get(url).json()
+                for url in ('/api/expenses/summary/', self.url)
+            ]
+        return summaries, call.call_count
+
+    def test_pool_matches_sequential_queries(self):
+        summaries, pooled = self.get_summaries()
+        self.assertEqual(pooled, 6)
+
+        with override_settings(AGGREGATE_WORKERS=0):
+            sequential, pooled = self.get_summaries()
+        self.assertEqual(pooled, 0)
+        self.assertEqual(summaries, sequential)
+
+    async def test_served_async(self):
+        token = TokenObtainPairSerializer.get_token(self.owner).access_token
+        headers = {'Authorization': f'Bearer {token}'}
+
+        response = await AsyncClient().get(self.url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_expenses'], 2)
+
+        response = await AsyncClient().get(self.url.replace(
+            str(self.household.pk), str(self.household.pk + 1)),
+            headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_atomic_batch_sees_its_writes(self):
+        response = self.client.post('/api/batch/', {
+            'atomic': True,
+            'requests': [
+                {'method': 'POST', 'path': '/api/expenses/', 'body': {
+                    'household_id': self.household.pk, 'name': 'Lunch',
+                    'amount': '5.00', 'payer_id': self.owner.pk}},
+                {'method': 'GET', 'path': self.url},
+            ],
+        }, format='json')
+        created, summary = response.json()['responses']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual(summary['status'], 200)
+        self.assertEqual(summary['body']['total_expenses'], 3)
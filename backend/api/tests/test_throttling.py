@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from api.models import Expense
+from api.throttling import slot_keys
+
+from .base import HouseholdTestCase
+
+BUCKETS = {
+    'user': {'capacity': 10, 'refill_rate': 0.01},
+    'household': {'capacity': 100, 'refill_rate': 1},
+}
+
+
+@override_settings(THROTTLE_BUCKETS=BUCKETS,
+                   THROTTLE_COSTS={'household_settlement_plan': 10})
+class AdmitComputationTests(HouseholdTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/households/{self.household.pk}/settlement-plan/'
+
+    def add_expense(self):
+        Expense.objects.create(
+            household=self.household, name='Dinner', amount=Decimal('10.00'),
+            author=self.owner, payer=self.owner)
+
+    def test_new_computation_is_throttled(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.add_expense()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_polls_answered_from_the_version_are_free(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        for _ in range(20):
+            self.assertEqual(
+                self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+                .status_code, 304)
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(COMPUTATION_CONCURRENCY=1)
+    def test_concurrency_limit(self):
+        key = slot_keys()[0]
+        cache.add(key, True)
+        response = self.client.get('/api/expenses/summary/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+        cache.delete(key)
+        response = self.client.get('/api/expenses/summary/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(key))
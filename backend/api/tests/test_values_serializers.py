@@ -0,0 +1,111 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from api.models import (
+    Expense, ExpenseCategory, ExpenseSplit, ShoppingListItem, Task
+)
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    ExpenseCategoryListSerializer, ExpenseCategoryListValuesSerializer,
+    ExpenseListSerializer, ExpenseListValuesSerializer,
+    ShoppingListItemSerializer, ShoppingListItemValuesSerializer,
+    TaskSerializer, TaskValuesSerializer
+)
+
+from .base import create_household, create_user
+
+
+class ValuesSerializerOutputTests(APITestCase):
+    """
+    The ``.values()`` fast paths must render byte for byte what their
+    serializers render, they reimplement the serializers' field logic.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('a', profile_picture='profile_pictures/a.png')
+        cls.member = create_user('b')
+        cls.household = create_household(cls.owner, cls.member)
+        household = cls.household
+
+        ExpenseCategory.objects.create(household=household, name='Food',
+                                       icon='🍕')
+        ExpenseCategory.objects.create(household=household, name='Rent',
+                                       icon='🏠')
+
+        explicit = Expense.objects.create(
+            household=household, name='Dinner', description='Pizza',
+            amount=Decimal('30.00'), author=cls.owner, payer=cls.owner)
+        ExpenseSplit.objects.create(expense=explicit, user=cls.owner,
+                                    amount=Decimal('10.00'), is_settled=True)
+        ExpenseSplit.objects.create(expense=explicit, user=cls.member,
+                                    amount=Decimal('20.00'))
+        rule = Expense.objects.create(
+            household=household, name='Groceries', amount=Decimal('10.00'),
+            author=cls.member, payer=cls.member,
+            split_type=Expense.SPLIT_SHARES,
+            split_shares={str(cls.owner.pk): 1, str(cls.member.pk): 2})
+        ExpenseSplit.objects.create(expense=rule, user=cls.owner,
+                                    amount=Decimal('3.33'), is_settled=True)
+        Expense.objects.create(
+            household=household, name='Empty', amount=Decimal('0.50'),
+            author=cls.owner, payer=cls.member)
+        for expense in Expense.objects.all():
+            expense.refresh_settlement_state()
+
+        Task.objects.create(household=household, name='Dishes',
+                            added_by=cls.owner)
+        Task.objects.create(
+            household=household, name='Bins', description='Tuesday',
+            due_date=timezone.now() + timedelta(days=1),
+            added_by=cls.member, is_completed=True)
+
+        ShoppingListItem.objects.create(household=household, name='Milk',
+                                        added_by=cls.owner)
+        ShoppingListItem.objects.create(
+            household=household, name='Flour', quantity=2, unit='kg',
+            is_purchased=True, purchased_at=timezone.now(),
+            added_by=cls.member, purchased_by=cls.owner)
+
+    def assertSameOutput(self, serializer_class, values_serializer_class,
+                         queryset, query=''):
+        request = Request(APIRequestFactory().get('/' + query))
+        context = {'request': request}
+        renderer = FastJSONRenderer()
+
+        expected = serializer_class(queryset, many=True, context=context)
+        actual = values_serializer_class(
+            values_serializer_class.values(queryset), context=context)
+        self.assertTrue(expected.data)
+        self.assertEqual(renderer.render(actual.data),
+                         renderer.render(expected.data))
+
+    def test_expense_list(self):
+        queryset = Expense.objects.filter(
+            household=self.household).order_by('-created_at', '-id')
+        self.assertSameOutput(ExpenseListSerializer,
+                              ExpenseListValuesSerializer, queryset)
+        self.assertSameOutput(ExpenseListSerializer,
+                              ExpenseListValuesSerializer, queryset,
+                              '?fields=id,payer,total_settled')
+
+    def test_task_list(self):
+        queryset = Task.objects.filter(
+            household=self.household).order_by('-created_at')
+        self.assertSameOutput(TaskSerializer, TaskValuesSerializer, queryset)
+
+    def test_shopping_list(self):
+        queryset = ShoppingListItem.objects.filter(
+            household=self.household).order_by('-added_at')
+        self.assertSameOutput(ShoppingListItemSerializer,
+                              ShoppingListItemValuesSerializer, queryset)
+
+    def test_category_list(self):
+        queryset = ExpenseCategory.objects.filter(
+            household=self.household).order_by('name')
+        self.assertSameOutput(ExpenseCategoryListSerializer,
+                              ExpenseCategoryListValuesSerializer, queryset)
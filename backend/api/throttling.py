@@ -0,0 +1,174 @@
+"""
+Admission control for expensive endpoints.
+
+Their handlers are decorated with ``admit_computation``, below any
+``versioned_household_get``, so that only requests that compute a response
+are charged, while 304s and cached responses are free.
+
+``CostThrottle`` charges each request to a token bucket of its user and,
+on household endpoints, one of the household. A bucket holds up to
+``capacity`` tokens and regains ``refill_rate`` tokens a second, see
+``THROTTLE_BUCKETS``. A request costs what ``THROTTLE_COSTS`` lists for its
+view, 1 otherwise, and is only admitted when all of its buckets can pay.
+Like DRF's own throttles, buckets are read and written without a lock, so
+concurrent requests may now and then spend the same tokens.
+
+``admit_computation`` also bounds how many handlers run at once, through
+``COMPUTATION_CONCURRENCY`` slot keys taken with the cache's atomic
+``add()``. The slot of a worker that died mid-request is freed after
+``COMPUTATION_TIMEOUT`` seconds.
+
+Everything is kept in the ``THROTTLE_CACHE_ALIAS`` cache, and so shared by
+the workers using the same cache server. With ``LocMemCache`` the limits
+apply per process.
+"""
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from .cache import count
+
+SCOPES = ('user', 'household')
+ALLOWED_KEY = 'throttle:allowed'
+REJECTED_KEY = 'throttle:computations:rejected'
+
+
+def get_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def throttled_key(scope):
+    return f'throttle:{scope}:throttled'
+
+
+def slot_keys():
+    return [
+        f'throttle:computations:{slot}'
+        for slot in range(settings.COMPUTATION_CONCURRENCY)
+    ]
+
+
+class CostThrottle(BaseThrottle):
+    """Cost-weighted token buckets per user and per household"""
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_buckets(self, request, view):
+        """Return the cache keys and scopes of the buckets to charge."""
+        if request.user.is_authenticated:
+            user_ident = request.user.pk
+        else:
+            user_ident = self.get_ident(request)
+        buckets = {f'throttle:user:{user_ident}': 'user'}
+
+        household_id = view.kwargs.get('household_id')
+        if household_id is not None:
+            buckets[f'throttle:household:{household_id}'] = 'household'
+        return buckets
+
+    def allow_request(self, request, view):
+        cost = settings.THROTTLE_COSTS.get(view.__class__.__name__, 1)
+        buckets = self.get_buckets(request, view)
+        cache = get_cache()
+        states = cache.get_many(buckets)
+        now = time.time()
+
+        levels = {}
+        waits = []
+        for key, scope in buckets.items():
+            capacity = settings.THROTTLE_BUCKETS[scope]['capacity']
+            refill_rate = settings.THROTTLE_BUCKETS[scope]['refill_rate']
+            level, updated_at = states.get(key, (capacity, now))
+            level = min(capacity, level + (now - updated_at) * refill_rate)
+            if level < cost:
+                waits.append((cost - level) / refill_rate)
+                count(throttled_key(scope), cache)
+            levels[key] = level - cost
+
+        if waits:
+            self.wait_seconds = max(waits)
+            return False
+
+        for key, level in levels.items():
+            bucket = settings.THROTTLE_BUCKETS[buckets[key]]
+            # A bucket that has filled up again is the same as none
+            timeout = math.ceil(
+                (bucket['capacity'] - level) / bucket['refill_rate'])
+            cache.set(key, (level, now), timeout)
+        count(ALLOWED_KEY, cache)
+        return True
+
+    def wait(self):
+        # Rounded up, Retry-After is in whole seconds
+        return math.ceil(self.wait_seconds)
+
+
+def take_slot(request):
+    """
+    Charge the request to ``CostThrottle`` and take a computation slot,
+    returning its key, or raise ``Throttled``.
+    """
+    throttle = CostThrottle()
+    if not throttle.allow_request(request, request.parser_context['view']):
+        raise Throttled(wait=throttle.wait())
+
+    cache = get_cache()
+    for key in slot_keys():
+        if cache.add(key, True, settings.COMPUTATION_TIMEOUT):
+            return key
+    count(REJECTED_KEY, cache)
+    raise Throttled(wait=settings.COMPUTATION_RETRY_AFTER)
+
+
+def admit_computation(view):
+    """
+    Decorate a view's handler, sync or async, to answer 429 with
+    ``Retry-After`` instead of running when ``CostThrottle`` denies the
+    request, or while ``COMPUTATION_CONCURRENCY`` decorated handlers are
+    running. Use ``method_decorator`` for class-based views.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            key = await sync_to_async(take_slot)(request)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                await sync_to_async(get_cache().delete)(key)
+        return wrapped
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        key = take_slot(request)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            get_cache().delete(key)
+    return wrapped
+
+
+def throttle_stats():
+    """
+    Admitted and throttled requests since the counters were last evicted,
+    and the computations currently running.
+    """
+    keys = [ALLOWED_KEY, REJECTED_KEY, *map(throttled_key, SCOPES)]
+    values = get_cache().get_many(keys + slot_keys())
+    return {
+        'allowed': values.get(ALLOWED_KEY, 0),
+        'throttled': {
+            scope: values.get(throttled_key(scope), 0) for scope in SCOPES
+        },
+        'computations': {
+            'running': sum(key in values for key in slot_keys()),
+            'limit': settings.COMPUTATION_CONCURRENCY,
+            'rejected': values.get(REJECTED_KEY, 0),
+        },
+    }
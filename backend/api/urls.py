@@ -3,13 +3,15 @@ from django.urls import path
 from .views import (
     UserListCreateView, UserDetailView,
     TokenObtainPairView, TokenRefreshView,
-    HouseholdListCreateView, HouseholdDetailView,
+    HouseholdListCreateView, HouseholdDetailView, HouseholdMemberListView,
     MembershipListCreateView, MembershipDetailView,
-    ExpenseListCreateView, ExpenseDetailView, user_expense_summary, household_expense_summary,
+    ExpenseListCreateView, ExpenseDetailView, UserExpenseSummaryView, HouseholdExpenseSummaryView,
+    household_expense_import, household_expense_export,
     ExpenseCategoryListCreateView, ExpenseCategoryDetailView, household_categories,
     TaskListCreateView, TaskDetailView,
     ShoppingListItemListCreateView, ShoppingListItemDetailView,
-    household_balances, household_settlement_plan, process_settlement
+    household_balances, household_settlement_plan, process_settlement,
+    household_changes, household_events, batch, cache_stats, throttle_stats
 )
 
 urlpatterns = [
@@ -19,13 +21,21 @@ urlpatterns = [
     path('auth/token/refresh/', TokenRefreshView.as_view()),
     path('households/', HouseholdListCreateView.as_view()),
     path('households/<int:pk>/', HouseholdDetailView.as_view()),
+    path('households/<int:household_id>/members/',
+         HouseholdMemberListView.as_view()),
+    path('households/<int:household_id>/changes/', household_changes),
+    path('households/<int:household_id>/events/', household_events),
     path('memberships/', MembershipListCreateView.as_view()),
     path('memberships/<int:pk>/', MembershipDetailView.as_view()),
     path('expenses/', ExpenseListCreateView.as_view()),
     path('expenses/<int:pk>/', ExpenseDetailView.as_view()),
-    path('expenses/summary/', user_expense_summary),
+    path('expenses/summary/', UserExpenseSummaryView.as_view()),
     path('households/<int:household_id>/expenses/summary/',
-         household_expense_summary),
+         HouseholdExpenseSummaryView.as_view()),
+    path('households/<int:household_id>/expenses/bulk/',
+         household_expense_import),
+    path('households/<int:household_id>/expenses/export/',
+         household_expense_export),
     path('categories/', ExpenseCategoryListCreateView.as_view()),
     path('categories/<int:pk>/', ExpenseCategoryDetailView.as_view()),
     path('households/<int:household_id>/categories/', household_categories),
@@ -40,4 +50,7 @@ urlpatterns = [
          household_settlement_plan),
     path('households/<int:household_id>/settlement-process/',
          process_settlement),
+    path('batch/', batch),
+    path('cache/stats/', cache_stats),
+    path('throttle/stats/', throttle_stats),
 ]
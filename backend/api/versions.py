@@ -0,0 +1,183 @@
+"""
+Per-household change versions.
+
+Every write to a household's data increments ``Household.version``, so a
+response computed from that data can be identified by the household id and
+version alone. Writes to synced objects also append to the household's
+change log, which numbers its entries from the version. Model writes are
+tracked with signals, bulk operations that bypass them record their changes
+themselves.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import cache_response, get_cached_response
+from .models import (
+    Expense, ExpenseCategory, ExpenseSplit, Household, HouseholdChange,
+    Membership, ShoppingListItem, Task, User
+)
+
+# User fields rendered inside household resources, changes to them are
+# logged for each of the user's households
+USER_FIELDS = {'username', 'email', 'profile_picture'}
+
+CHANGE_KINDS = {
+    Expense: HouseholdChange.EXPENSE,
+    ExpenseCategory: HouseholdChange.CATEGORY,
+    Task: HouseholdChange.TASK,
+    ShoppingListItem: HouseholdChange.SHOPPING_ITEM,
+    Membership: HouseholdChange.MEMBERSHIP,
+}
+
+
+def get_household_version(user, household_id):
+    """
+    Return the household's version, or ``None`` if it does not exist or
+    the user is not a member. This is a single indexed query.
+    """
+    try:
+        household_id = int(household_id)
+    except (TypeError, ValueError):
+        return None
+    return Household.objects.filter(
+        pk=household_id, members=user
+    ).values_list('version', flat=True).first()
+
+
+def get_household_etag(request, household_id):
+    """
+    Return a strong ETag for the request at the household's current
+    version, or ``None`` if the household is not accessible.
+    """
+    version = get_household_version(request.user, household_id)
+    if version is None:
+        return None
+    key = ':'.join((
+        str(household_id), str(version), str(request.user.pk),
+        request.get_full_path(), request.META.get('HTTP_ACCEPT', '')
+    ))
+    digest = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(etag, if_none_match):
+    """Weak comparison, as compressed responses carry ``W/`` ETags."""
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return etags == ['*'] or etag.removeprefix('W/') in (
+        tag.removeprefix('W/') for tag in etags)
+
+
+def versioned_household_get(lookup='household_id'):
+    """
+    Decorate a GET handler to send an ETag for the household's version,
+    answer a matching ``If-None-Match`` with 304 and serve JSON responses
+    from the versioned response cache, all before the handler runs.
+
+    The household id is taken from the URL keyword argument ``lookup`` or,
+    failing that, the query parameter of the same name. Requests without
+    an accessible household are passed through unchanged, as are those
+    run inside a transaction that may yet be rolled back, see
+    ``api.views.batch``. Use ``method_decorator`` for class-based views.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            # A version read inside the transaction is handed out again
+            # by the next write if the transaction is rolled back
+            if getattr(request, 'in_transaction', False):
+                return view(request, *args, **kwargs)
+
+            household_id = kwargs.get(lookup,
+                                      request.query_params.get(lookup))
+            etag = get_household_etag(request, household_id)
+            if etag is None:
+                return view(request, *args, **kwargs)
+
+            if etag_matches(etag, request.META.get('HTTP_IF_NONE_MATCH')):
+                return Response(status=status.HTTP_304_NOT_MODIFIED,
+                                headers={'ETag': etag})
+
+            # The browsable API embeds per-session tokens
+            cacheable = request.accepted_renderer.format == 'json'
+            response = get_cached_response(etag) if cacheable else None
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if cacheable and isinstance(response, Response):
+                    cache_response(etag, response)
+            if response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+            return response
+        return wrapped
+    return decorator
+
+
+def bump_for_household(sender, instance, created=False, **kwargs):
+    if not created:
+        Household.objects.filter(pk=instance.pk).bump_version()
+
+
+def forget_changes(sender, instance, **kwargs):
+    # Drop the entries recorded while the household's data was cascade
+    # deleted, the household row goes last
+    HouseholdChange.objects.filter(household_id=instance.pk).delete()
+
+
+def record_save(sender, instance, **kwargs):
+    HouseholdChange.objects.record(
+        instance.household_id, CHANGE_KINDS[sender], [instance.pk])
+
+
+def record_delete(sender, instance, **kwargs):
+    HouseholdChange.objects.record(
+        instance.household_id, CHANGE_KINDS[sender], [instance.pk],
+        deleted=True)
+
+
+def record_split(sender, instance, **kwargs):
+    # Splits are synced as part of their expense. Saves refresh the
+    # expense, which records the change already.
+    household_id = Expense.objects.filter(
+        pk=instance.expense_id
+    ).values_list('household_id', flat=True).first()
+    if household_id is not None:
+        HouseholdChange.objects.record(
+            household_id, HouseholdChange.EXPENSE, [instance.expense_id])
+
+
+def record_category_expenses(sender, instance, **kwargs):
+    # The expenses' category is nulled in one UPDATE, without signals
+    expenses = Expense.objects.filter(category=instance)
+    expense_ids = list(expenses.values_list('pk', flat=True))
+    expenses.update(updated_at=Now())
+    HouseholdChange.objects.record(
+        instance.household_id, HouseholdChange.EXPENSE, expense_ids)
+
+
+def record_user(sender, instance, created=False, update_fields=None,
+                **kwargs):
+    if created or (update_fields is not None
+                   and not USER_FIELDS.intersection(update_fields)):
+        return
+    for household_id in Household.objects.filter(
+            members=instance.pk).values_list('pk', flat=True):
+        HouseholdChange.objects.record(
+            household_id, HouseholdChange.USER, [instance.pk])
+
+
+def connect_signals():
+    for model in CHANGE_KINDS:
+        post_save.connect(record_save, sender=model)
+        post_delete.connect(record_delete, sender=model)
+    post_save.connect(bump_for_household, sender=Household)
+    post_delete.connect(forget_changes, sender=Household)
+    post_delete.connect(record_split, sender=ExpenseSplit)
+    pre_delete.connect(record_category_expenses, sender=ExpenseCategory)
+    post_save.connect(record_user, sender=User)
@@ -8,7 +8,8 @@ from .user import (
 )
 from .household import (
     HouseholdListCreateView,
-    HouseholdDetailView
+    HouseholdDetailView,
+    HouseholdMemberListView
 )
 from .membership import (
     MembershipListCreateView,
@@ -17,9 +18,11 @@ from .membership import (
 from .expense import (
     ExpenseListCreateView,
     ExpenseDetailView,
-    user_expense_summary,
-    household_expense_summary
+    UserExpenseSummaryView,
+    HouseholdExpenseSummaryView
 )
+from .expense_import import household_expense_import
+from .expense_export import household_expense_export
 from .expense_category import (
     ExpenseCategoryListCreateView,
     ExpenseCategoryDetailView,
@@ -38,3 +41,7 @@ from .settlements import (
     household_settlement_plan,
     process_settlement
 )
+from .changes import household_changes
+from .events import household_events
+from .batch import batch
+from .operations import cache_stats, throttle_stats
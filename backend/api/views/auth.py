@@ -1,12 +1,14 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework_simplejwt import views as jwt_views
 
+from ..serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
 
 @extend_schema(tags=['2. Authentication'])
 class TokenObtainPairView(jwt_views.TokenObtainPairView):
-    ...
+    serializer_class = TokenObtainPairSerializer
 
 
 @extend_schema(tags=['2. Authentication'])
 class TokenRefreshView(jwt_views.TokenRefreshView):
-    ...
+    serializer_class = TokenRefreshSerializer
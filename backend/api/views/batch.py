@@ -0,0 +1,178 @@
+import io
+import json
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.handlers.exception import response_for_exception
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from ..serializers import BatchRequestSerializer
+
+# Where api.urls is included, only its views can be batched
+API_PREFIX = '/api/'
+
+# Request headers that describe the batch request's own body or caching
+BATCH_ONLY_HEADERS = {
+    'CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_ACCEPT', 'HTTP_ACCEPT_ENCODING',
+    'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IDEMPOTENCY_KEY',
+}
+
+
+def error_response(status_code, detail):
+    return HttpResponse(json.dumps({'detail': detail}),
+                        status=status_code, content_type='application/json')
+
+
+def build_request(request, method, path, body, headers):
+    """
+    Build the ``HttpRequest`` of a sub-request. It inherits the batch
+    request's metadata and authenticated user, so its views skip
+    middleware and authentication.
+    """
+    url = urlsplit(path)
+    content = json.dumps(body).encode() if body is not None else b''
+
+    sub_request = HttpRequest()
+    sub_request.method = method
+    sub_request.path = sub_request.path_info = url.path
+    sub_request.META = {
+        key: value for key, value in request.META.items()
+        if key not in BATCH_ONLY_HEADERS
+    }
+    sub_request.META.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(content)),
+        'HTTP_ACCEPT': 'application/json',
+    })
+    for name, value in headers.items():
+        sub_request.META['HTTP_' + name.upper().replace('-', '_')] = value
+    sub_request.GET = QueryDict(url.query)
+    sub_request.COOKIES = request.COOKIES
+    sub_request._stream = io.BytesIO(content)
+    sub_request._read_started = False
+
+    # Picked up by rest_framework.request.Request in place of the
+    # authentication classes
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def get_response(request, method, path, body=None, headers=None,
+                 in_transaction=False):
+    url_path = urlsplit(path).path
+    if not url_path.startswith(API_PREFIX):
+        return error_response(status.HTTP_404_NOT_FOUND, 'Not found.')
+    try:
+        match = resolve(url_path[len(API_PREFIX) - 1:], urlconf='api.urls')
+    except Resolver404:
+        return error_response(status.HTTP_404_NOT_FOUND, 'Not found.')
+    # Other views expect the middleware, such as the event stream
+    if (match.func is batch
+            or not issubclass(getattr(match.func, 'cls', type), APIView)):
+        return error_response(status.HTTP_400_BAD_REQUEST,
+                              'This endpoint cannot be batched.')
+
+    sub_request = build_request(request, method, path, body, headers or {})
+    sub_request.resolver_match = match
+    # Keeps the responses out of the versioned cache, see api.versions
+    sub_request.in_transaction = in_transaction
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    try:
+        response = view(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except Exception as exc:
+        response = response_for_exception(sub_request, exc)
+    return response
+
+
+def encode_response(response):
+    """Embed the rendered response as is when it is JSON."""
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+
+    if not content:
+        body = b'null'
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = content
+    else:
+        body = json.dumps(content.decode(response.charset)).encode()
+
+    headers = {name: value for name, value in response.items()
+               if name != 'Content-Length'}
+    return b'{"status":%d,"headers":%s,"body":%s}' % (
+        response.status_code, json.dumps(headers).encode(), body)
+
+
+@extend_schema(
+    tags=['10. Operations'],
+    request=BatchRequestSerializer,
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'responses': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'status': {'type': 'integer'},
+                            'headers': {'type': 'object'},
+                            'body': {},
+                        },
+                    },
+                },
+            },
+        },
+    },
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several API requests in one, as the authenticated user, and return
+    their responses in order. Each sub-request has a ``method``, the
+    absolute ``path`` of an endpoint under ``/api/`` with an optional query
+    string, and optionally a JSON ``body`` and ``headers``. With ``atomic``
+    the sub-requests share one transaction, which is rolled back and the
+    batch stopped at the first response with an error status. Their GET
+    responses then carry no ETag and bypass the response cache.
+    """
+    serializer = BatchRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    sub_requests = serializer.validated_data['requests']
+
+    responses = []
+    if serializer.validated_data['atomic']:
+        with transaction.atomic():
+            for sub_request in sub_requests:
+                response = get_response(request, **sub_request,
+                                        in_transaction=True)
+                responses.append(encode_response(response))
+                if response.status_code >= 400:
+                    transaction.set_rollback(True)
+                    break
+    else:
+        for sub_request in sub_requests:
+            response = get_response(request, **sub_request)
+            responses.append(encode_response(response))
+
+    return HttpResponse(
+        b'{"responses":[%s]}' % b','.join(responses),
+        content_type='application/json'
+    )
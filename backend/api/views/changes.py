@@ -0,0 +1,162 @@
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import (
+    Expense, ExpenseCategory, Household, HouseholdChange, Membership,
+    ShoppingListItem, Task, User
+)
+from ..permissions import IsHouseholdMember
+from ..serializers import (
+    ExpenseSerializer, ExpenseCategoryListSerializer, MembershipSerializer,
+    ShoppingListItemSerializer, TaskSerializer, UserSerializer
+)
+
+# Response key, queryset of a household's objects and serializer of each
+# kind of synced object
+SYNCED_KINDS = {
+    HouseholdChange.EXPENSE: (
+        'expenses',
+        lambda household: Expense.objects.filter(
+            household=household
+        ).select_related(
+            'household', 'author', 'payer', 'category'
+        ).prefetch_related('splits__user'),
+        ExpenseSerializer
+    ),
+    HouseholdChange.CATEGORY: (
+        'categories',
+        lambda household: ExpenseCategory.objects.filter(
+            household=household),
+        ExpenseCategoryListSerializer
+    ),
+    HouseholdChange.TASK: (
+        'tasks',
+        lambda household: Task.objects.filter(
+            household=household).select_related('added_by'),
+        TaskSerializer
+    ),
+    HouseholdChange.SHOPPING_ITEM: (
+        'shopping_items',
+        lambda household: ShoppingListItem.objects.filter(
+            household=household).select_related('added_by', 'purchased_by'),
+        ShoppingListItemSerializer
+    ),
+    HouseholdChange.MEMBERSHIP: (
+        'memberships',
+        lambda household: Membership.objects.filter(household=household),
+        MembershipSerializer
+    ),
+    HouseholdChange.USER: (
+        'users',
+        lambda household: User.objects.filter(households=household),
+        UserSerializer
+    ),
+}
+
+
+def parse_cursor(value):
+    try:
+        cursor = int(value)
+    except ValueError:
+        raise ValidationError({'since': 'Enter a valid cursor.'})
+    if cursor < 0:
+        raise ValidationError({'since': 'Enter a valid cursor.'})
+    return cursor
+
+
+def serialize_objects(request, household, ids_by_kind):
+    """
+    Serialize the household's objects of each kind, all of them for kinds
+    mapped to ``None``. Returns the data by response key and the ids that
+    no longer exist.
+    """
+    data = {}
+    missing = []
+    for kind, (key, get_queryset, serializer_class) in SYNCED_KINDS.items():
+        queryset = get_queryset(household)
+        ids = ids_by_kind.get(kind, ())
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids) if ids else queryset.none()
+        objects = list(queryset.order_by('pk'))
+        data[key] = serializer_class(
+            objects, many=True, context={'request': request}).data
+        if ids:
+            found = {obj.pk for obj in objects}
+            missing.extend({'type': kind, 'id': pk}
+                           for pk in sorted(ids) if pk not in found)
+    return data, missing
+
+
+@extend_schema(
+    tags=['3. Households'],
+    parameters=[
+        OpenApiParameter(
+            'since', int,
+            description='Cursor returned by the previous sync. Without it '
+                        'every synced object is returned.'),
+    ]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+def household_changes(request, household_id):
+    """
+    Get the household's expenses, categories, tasks, shopping list items,
+    memberships and members' profiles changed since a cursor, with the
+    expenses' splits. Deleted objects are listed in ``deleted``. Pass the
+    returned ``cursor`` as ``since`` to continue, ``has_more`` is set while
+    changes remain.
+    """
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
+
+    since = request.query_params.get('since')
+    if since is None:
+        # Changes committed after the version was read are sent again by
+        # the next sync, which clients apply idempotently
+        data, deleted = serialize_objects(
+            request, household, dict.fromkeys(SYNCED_KINDS))
+        return Response({
+            'cursor': household.version,
+            'has_more': False,
+            **data,
+            'deleted': deleted,
+        }, status=status.HTTP_200_OK)
+
+    cursor = parse_cursor(since)
+    changes = list(HouseholdChange.objects.filter(
+        household=household,
+        sequence__gt=cursor
+    ).order_by('sequence').values_list(
+        'sequence', 'kind', 'object_id', 'deleted'
+    )[:settings.CHANGES_PAGE_SIZE + 1])
+    has_more = len(changes) > settings.CHANGES_PAGE_SIZE
+    changes = changes[:settings.CHANGES_PAGE_SIZE]
+    if changes:
+        cursor = changes[-1][0]
+
+    # Only the latest change of each object matters
+    latest = {}
+    for _, kind, object_id, is_deleted in changes:
+        latest[kind, object_id] = is_deleted
+
+    changed = {}
+    deleted = []
+    for (kind, object_id), is_deleted in latest.items():
+        if is_deleted:
+            deleted.append({'type': kind, 'id': object_id})
+        else:
+            changed.setdefault(kind, set()).add(object_id)
+
+    data, missing = serialize_objects(request, household, changed)
+    return Response({
+        'cursor': cursor,
+        'has_more': has_more,
+        **data,
+        'deleted': deleted + missing,
+    }, status=status.HTTP_200_OK)
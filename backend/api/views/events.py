@@ -0,0 +1,159 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, status
+
+from ..authentication import CachedJWTAuthentication
+from ..events import get_broadcaster, read_events
+from ..models import HouseholdChange
+from ..permissions import IsHouseholdMember
+from ..versions import get_household_version
+
+KEEPALIVE = b': keepalive\n\n'
+
+
+def authenticate(request):
+    """
+    Authenticate the request from its ``Authorization`` header or, as
+    ``EventSource`` cannot send headers, its ``token`` query parameter.
+    Return the user and the validated token.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is not None:
+        raw_token = authentication.get_raw_token(header)
+    else:
+        raw_token = request.GET.get('token', '').encode() or None
+    if raw_token is None:
+        raise exceptions.NotAuthenticated()
+
+    validated_token = authentication.get_validated_token(raw_token)
+    user = authentication.get_token_user(validated_token)
+    if user is None:
+        user = authentication.get_user(validated_token)
+    return user, validated_token
+
+
+def is_subscribed(household_id, validated_token):
+    """
+    Return whether the stream may go on: the token's user is still active,
+    has not changed their password and is still a member of the household.
+    """
+    try:
+        user = CachedJWTAuthentication().get_user(validated_token)
+    except exceptions.AuthenticationFailed:
+        return False
+    return get_household_version(user, household_id) is not None
+
+
+def parse_last_event_id(request, version):
+    # Clients reconnecting after a drop resume where they left off
+    try:
+        last_event_id = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        return version
+    return min(max(last_event_id, 0), version)
+
+
+def format_event(event):
+    return (
+        f'id: {event["version"]}\n'
+        f'data: {json.dumps(event)}\n\n'
+    ).encode()
+
+
+async def stream_events(household_id, version, validated_token):
+    """
+    Yield the events after ``version``. The stream ends when the token
+    expires, and when a membership change or a keepalive finds that the
+    user may no longer read the household, see ``is_subscribed``.
+    """
+    expires_at = validated_token['exp']
+    subscription = get_broadcaster().subscribe(household_id, version)
+    # Events committed before the subscription started are read back from
+    # the change log
+    replay = True
+    try:
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+
+            if replay:
+                events = await sync_to_async(read_events)(
+                    household_id, version, settings.EVENTS_QUEUE_SIZE)
+                replay = len(events) == settings.EVENTS_QUEUE_SIZE
+            else:
+                events = await subscription.get(
+                    min(settings.EVENTS_KEEPALIVE, remaining))
+                if events is None:
+                    # Missed while falling behind, read them back
+                    replay = True
+                    continue
+
+            events = [event for event in events if event['version'] > version]
+            if not events:
+                if not await sync_to_async(is_subscribed)(
+                        household_id, validated_token):
+                    return
+                yield KEEPALIVE
+                continue
+
+            for event in events:
+                yield format_event(event)
+            version = events[-1]['version']
+
+            # Stop streaming to users who just left the household
+            if any(event['type'] == HouseholdChange.MEMBERSHIP
+                   for event in events):
+                if not await sync_to_async(is_subscribed)(
+                        household_id, validated_token):
+                    return
+    finally:
+        subscription.close()
+
+
+@require_GET
+async def household_events(request, household_id):
+    """
+    Stream the household's change events to a member as server-sent events.
+    Each event's data is a JSON object with the changed object's ``type``,
+    ``id`` and the household ``version`` the change was made at, and
+    ``deleted`` for deletions. The version is also the event id, so that
+    reconnecting clients receive the events they missed. The stream is
+    closed when the access token expires, clients reconnect with a fresh
+    one.
+
+    Needs ASGI, under WSGI an open stream would hold a worker thread.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'detail': 'Event streams are only served under ASGI'},
+            status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    try:
+        user, validated_token = await sync_to_async(authenticate)(request)
+    except exceptions.APIException as exc:
+        detail = exc.detail
+        if not isinstance(detail, dict):
+            detail = {'detail': detail}
+        return JsonResponse(detail, status=exc.status_code)
+
+    version = await sync_to_async(get_household_version)(user, household_id)
+    if version is None:
+        return JsonResponse({'detail': IsHouseholdMember.message},
+                            status=status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(
+        stream_events(household_id, parse_last_event_id(request, version),
+                      validated_token),
+        content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tells nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
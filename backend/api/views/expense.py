@@ -1,22 +1,93 @@
-from django.db.models import Q
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from functools import partial
+
+from django.db.models import Exists, OuterRef, Q
 from django.db import models
+from django.shortcuts import aget_object_or_404
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.dateparse import parse_date, parse_datetime
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-
-from ..models import Expense, Household, ExpenseCategory
-from ..serializers import ExpenseSerializer, ExpenseListSerializer
+from rest_framework.views import APIView
+
+from ..aggregates import gather_aggregates
+from ..idempotency import IDEMPOTENCY_PARAMETERS, idempotent
+from ..models import Expense, ExpenseSplit, Household
+from ..pagination import KeysetPagination
+from ..permissions import IsHouseholdMember
+from ..search import search_expenses
+from ..throttling import admit_computation
+from ..versions import versioned_household_get
+from .mixins import (
+    NORMALIZE_PARAMETERS, AsyncDispatchMixin, ValuesListMixin
+)
+from ..serializers import (
+    ExpenseSerializer, ExpenseListSerializer, ExpenseListValuesSerializer
+)
 from algorithms.statistics import *
 
 
+def parse_datetime_param(name, value, end_of_day=False):
+    """
+    Parse an ISO 8601 date or datetime query parameter into an aware
+    datetime. A bare date resolves to the start of that day, or to the start
+    of the following day when used as an exclusive upper bound so the whole
+    day is included.
+    """
+    try:
+        day = parse_date(value)
+        if day is not None:
+            if end_of_day:
+                day += timedelta(days=1)
+            parsed = datetime.combine(day, time.min)
+        else:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValueError
+    except ValueError:
+        raise ValidationError({name: 'Enter a valid date or datetime.'})
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_amount_param(name, value):
+    """Parse a decimal amount query parameter."""
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: 'Enter a valid amount.'})
+    if not amount.is_finite():
+        raise ValidationError({name: 'Enter a valid amount.'})
+    return amount
+
+
+FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        'fields', str,
+        description='Comma separated list of fields to include'),
+    OpenApiParameter(
+        'expand', str,
+        description='Comma separated list of related objects to embed in '
+                    'full, e.g. household'),
+]
+
+
 @extend_schema(tags=['6. Expenses'])
-class ExpenseListCreateView(generics.ListCreateAPIView):
+class ExpenseListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     """
     List expenses for authenticated user's households or create a new expense.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    pagination_ordering = ('-created_at', '-id')
+    values_serializer_class = ExpenseListValuesSerializer
 
     def get_serializer_class(self):  # type: ignore
         if self.request.method == 'GET':
@@ -26,7 +97,8 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):  # type: ignore
         """
         Return expenses from households where the user is a member.
-        Optionally filter by household_id, category_id, payer_id, or settlement status.
+        Optionally filter by household_id, category_id, payer_id, settlement
+        status, creation date range or amount range, or search by text.
         """
         user = self.request.user
         queryset = Expense.objects.filter(
@@ -58,38 +130,54 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
         settled = self.request.query_params.get('settled')  # type: ignore
         if settled is not None:
             if settled.lower() == 'true':
-                queryset = queryset.filter(splits__is_settled=True).distinct()
+                queryset = queryset.filter(is_fully_settled=True)
             elif settled.lower() == 'false':
-                queryset = queryset.filter(splits__is_settled=False).distinct()
+                queryset = queryset.filter(is_fully_settled=False)
 
-        return queryset.order_by('-created_at')
+        # Filter by creation date range if provided
+        created_after = self.request.query_params.get(  # type: ignore
+            'created_after'
+        )
+        if created_after:
+            queryset = queryset.filter(created_at__gte=parse_datetime_param(
+                'created_after', created_after
+            ))
 
-    def perform_create(self, serializer):
-        """Set the author to the current user and validate household access."""
-        household_id = serializer.validated_data['household_id']
+        created_before = self.request.query_params.get(  # type: ignore
+            'created_before'
+        )
+        if created_before:
+            queryset = queryset.filter(created_at__lt=parse_datetime_param(
+                'created_before', created_before, end_of_day=True
+            ))
+
+        # Filter by amount range if provided
+        amount_min = self.request.query_params.get(  # type: ignore
+            'amount_min'
+        )
+        if amount_min:
+            queryset = queryset.filter(
+                amount__gte=parse_amount_param('amount_min', amount_min)
+            )
 
-        # Check if user is a member of the household
-        try:
-            Household.objects.get(
-                id=household_id,
-                members=self.request.user
+        amount_max = self.request.query_params.get(  # type: ignore
+            'amount_max'
+        )
+        if amount_max:
+            queryset = queryset.filter(
+                amount__lte=parse_amount_param('amount_max', amount_max)
             )
-        except Household.DoesNotExist:
-            raise PermissionError(
-                'You do not have permission to create expenses in this household.'
-            )        # Validate category belongs to the same household if provided
-        category_id = serializer.validated_data.get('category_id')
-        if category_id:
-            try:
-                category = ExpenseCategory.objects.get(id=category_id)
-                if category.household.pk != household_id:
-                    raise PermissionError(
-                        'Category does not belong to the specified household.'
-                    )
-            except ExpenseCategory.DoesNotExist:
-                raise PermissionError('Invalid category.')
 
-        serializer.save(author=self.request.user)
+        # Search names and descriptions if a query is provided
+        query = self.request.query_params.get('q')  # type: ignore
+        if query:
+            queryset, ranked = search_expenses(queryset, query)
+            if ranked:
+                # Best bm25 matches first
+                self.pagination_ordering = ('search_rank', 'id')
+                return queryset.order_by('search_rank', 'id')
+
+        return queryset.order_by('-created_at', '-id')
 
     @extend_schema(
         parameters=[
@@ -100,47 +188,59 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
             OpenApiParameter(
                 'payer_id', int, description='Filter by payer ID'),
             OpenApiParameter(
-                'settled', bool, description='Filter by settlement status'),
+                'settled', bool,
+                description='Filter by whether every split is settled'),
+            OpenApiParameter(
+                'created_after', str,
+                description='Only expenses created on or after this '
+                            'ISO 8601 date or datetime'),
+            OpenApiParameter(
+                'created_before', str,
+                description='Only expenses created before this ISO 8601 '
+                            'datetime, or on or before this date'),
+            OpenApiParameter(
+                'amount_min', str,
+                description='Only expenses with at least this amount'),
+            OpenApiParameter(
+                'amount_max', str,
+                description='Only expenses with at most this amount'),
+            OpenApiParameter(
+                'q', str,
+                description='Search expense names and descriptions, '
+                            'results are ordered by relevance'),
+            FIELDS_PARAMETERS[0],
+            *NORMALIZE_PARAMETERS,
         ]
     )
+    @method_decorator(versioned_household_get())
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    @extend_schema(parameters=IDEMPOTENCY_PARAMETERS)
+    @method_decorator(idempotent)
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
 
-@extend_schema(tags=['6. Expenses'])
+
+@extend_schema(tags=['6. Expenses'], parameters=FIELDS_PARAMETERS)
 class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete an expense.
     """
     serializer_class = ExpenseSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsHouseholdMember]
 
     def get_queryset(self):  # type: ignore
-        """Return expenses from households where the user is a member."""
-        return Expense.objects.filter(
-            household__members=self.request.user
-        ).select_related(
-            'household', 'author', 'payer'
+        return Expense.objects.select_related(
+            'household', 'author', 'payer', 'category'
         ).prefetch_related('splits__user')
 
-    def get_object(self):
-        """Get expense and check permissions."""
-        expense = super().get_object()
-
-        # Check if user is a member of the expense's household
-        if self.request.user not in expense.household.members.all():
-            raise PermissionError(
-                'You do not have permission to access this expense.'
-            )
-
-        return expense
-
     def perform_destroy(self, instance):
         """Additional validation for deletion."""
         # Only allow author or household owner to delete
         if (self.request.user != instance.author and
                 self.request.user != instance.household.owner):
-            raise PermissionError(
+            raise PermissionDenied(
                 'You do not have permission to delete this expense.'
             )
 
@@ -148,92 +248,96 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 @extend_schema(tags=['6. Expenses'])
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def user_expense_summary(request):
-    """
-    Get summary of expenses for the authenticated user across all households.
-    """
-    user = request.user
+class UserExpenseSummaryView(AsyncDispatchMixin, APIView):
+    permission_classes = [IsAuthenticated]
 
-    total_expenses = Expense.objects.filter(
-        Q(payer=user) | Q(splits__user=user)
-    ).count()
+    @method_decorator(admit_computation)
+    async def get(self, request):
+        """
+        Get summary of expenses for the authenticated user across all
+        households.
+        """
+        user = request.user
+
+        total_expenses, splits, total_amount_paid = await gather_aggregates(
+            # Exists rather than a join, which would count an expense once
+            # per split
+            Expense.objects.filter(
+                Q(payer=user)
+                | Q(Exists(ExpenseSplit.objects.filter(
+                    expense=OuterRef('pk'), user=user)))
+                | Q(split_shares__has_key=str(user.pk))
+            ).count,
+            partial(load_effective_splits, user),
+            partial(calculate_user_amount_paid, user),
+        )
 
-    total_amount_paid = calculate_user_amount_paid(user)
-    total_amount_paid_self = calculate_user_amount_paid_self(user)
-    total_amount_owed = calculate_user_amount_owed(user)
-    net_balance = calculate_user_net_balance(user)
+        total_amount_paid_self = calculate_user_amount_paid_self(
+            user, splits=splits)
+        total_amount_owed = calculate_user_amount_owed(user, splits=splits)
+        net_balance = calculate_user_net_balance(user, splits=splits)
 
-    summary = {
-        'total_expenses': total_expenses,
-        'total_amount_paid': total_amount_paid,
-        'total_amount_paid_self': total_amount_paid_self,
-        'total_amount_owed': total_amount_owed,
-        'net_balance': net_balance,
-    }
+        summary = {
+            'total_expenses': total_expenses,
+            'total_amount_paid': total_amount_paid,
+            'total_amount_paid_self': total_amount_paid_self,
+            'total_amount_owed': total_amount_owed,
+            'net_balance': net_balance,
+        }
 
-    return Response(summary, status=status.HTTP_200_OK)
+        return Response(summary, status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=['6. Expenses'])
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def household_expense_summary(request, household_id):
-    """
-    Get summary of expenses for a specific household.
-    """
-    user = request.user
+class HouseholdExpenseSummaryView(AsyncDispatchMixin, APIView):
+    permission_classes = [IsAuthenticated, IsHouseholdMember]
 
-    # Check if user is a member of the household
-    try:
-        household = Household.objects.get(
-            id=household_id,
-            members=user
-        )
-    except Household.DoesNotExist:
-        return Response(
-            {'error': 'Household not found or you do not have access'},
-            status=status.HTTP_404_NOT_FOUND
+    @method_decorator(admit_computation)
+    async def get(self, request, household_id):
+        """
+        Get summary of expenses for a specific household.
+        """
+        user = request.user
+
+        # Membership is checked by IsHouseholdMember
+        household = await aget_object_or_404(Household, id=household_id)
+
+        totals, splits, user_amount_paid = await gather_aggregates(
+            partial(
+                Expense.objects.filter(household=household).aggregate,
+                total_expenses=models.Count('id'),
+                total_amount=models.Sum('amount')
+            ),
+            partial(load_effective_splits, household=household),
+            partial(calculate_user_amount_paid, user, household),
         )
+        total_expenses = totals['total_expenses']
+        total_amount = totals['total_amount'] or 0
 
-    total_expenses = Expense.objects.filter(household=household).count()
-    total_amount = Expense.objects.filter(household=household).aggregate(
-        total_amount=models.Sum('amount')
-    )['total_amount'] or 0
-
-    expenses = Expense.objects.filter(
-        household=household
-    ).prefetch_related('splits')
-
-    total_settled = sum(
-        split.amount for expense in expenses
-        for split in expense.splits.all()  # type: ignore
-        if split.is_settled
-    )
+        total_settled = sum(
+            split.amount for split in splits if split.is_settled
+        )
 
-    total_unsettled = sum(
-        split.amount for expense in expenses
-        for split in expense.splits.all()  # type: ignore
-        if not split.is_settled
-    )
+        total_unsettled = sum(
+            split.amount for split in splits if not split.is_settled
+        )
 
-    user_amount_paid = calculate_user_amount_paid(user, household)
-    user_amount_paid_self = calculate_user_amount_paid_self(user, household)
-    user_amount_owed = calculate_user_amount_owed(user, household)
-    user_balance = calculate_user_net_balance(user, household)
-
-    summary = {
-        'household_id': household_id,
-        'household_name': household.name,
-        'total_expenses': total_expenses,
-        'total_amount': total_amount,
-        'total_settled': total_settled,
-        'total_unsettled': total_unsettled,
-        'user_amount_paid': user_amount_paid,
-        'user_amount_paid_self': user_amount_paid_self,
-        'user_amount_owed': user_amount_owed,
-        'user_balance': user_balance,
-    }
-
-    return Response(summary, status=status.HTTP_200_OK)
+        user_amount_paid_self = calculate_user_amount_paid_self(
+            user, household, splits)
+        user_amount_owed = calculate_user_amount_owed(user, household, splits)
+        user_balance = calculate_user_net_balance(user, household, splits)
+
+        summary = {
+            'household_id': household_id,
+            'household_name': household.name,
+            'total_expenses': total_expenses,
+            'total_amount': total_amount,
+            'total_settled': total_settled,
+            'total_unsettled': total_unsettled,
+            'user_amount_paid': user_amount_paid,
+            'user_amount_paid_self': user_amount_paid_self,
+            'user_amount_owed': user_amount_owed,
+            'user_balance': user_balance,
+        }
+
+        return Response(summary, status=status.HTTP_200_OK)
@@ -1,19 +1,28 @@
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ..models import ExpenseCategory, Household
-from ..serializers import ExpenseCategorySerializer, ExpenseCategoryListSerializer
+from ..permissions import IsHouseholdMember, check_household_member
+from ..serializers import (
+    ExpenseCategorySerializer, ExpenseCategoryListSerializer,
+    ExpenseCategoryListValuesSerializer
+)
+from .mixins import ValuesListMixin
 
 
 @extend_schema(tags=['5. Expense Categories'])
-class ExpenseCategoryListCreateView(generics.ListCreateAPIView):
+class ExpenseCategoryListCreateView(ValuesListMixin,
+                                    generics.ListCreateAPIView):
     """
     List expense categories for authenticated user's households or create a new category.
     """
     permission_classes = [IsAuthenticated]
+    values_serializer_class = ExpenseCategoryListValuesSerializer
 
     def get_serializer_class(self):  # type: ignore
         if self.request.method == 'GET':
@@ -41,19 +50,8 @@ class ExpenseCategoryListCreateView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         """Validate household access before creating category."""
-        household_id = serializer.validated_data['household_id']
-
-        # Check if user is a member of the household
-        try:
-            Household.objects.get(
-                id=household_id,
-                members=self.request.user
-            )
-        except Household.DoesNotExist:
-            raise PermissionError(
-                'You do not have permission to create categories in this household.'
-            )
-
+        check_household_member(
+            self.request.user, serializer.validated_data['household_id'])
         serializer.save()
 
     @extend_schema(
@@ -72,33 +70,18 @@ class ExpenseCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     Retrieve, update, or delete an expense category.
     """
     serializer_class = ExpenseCategorySerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsHouseholdMember]
 
     def get_queryset(self):  # type: ignore
-        """Return categories from households where the user is a member."""
-        return ExpenseCategory.objects.filter(
-            household__members=self.request.user
-        ).select_related('household')
-
-    def get_object(self):
-        """Get category and check permissions."""
-        category = super().get_object()
-
-        # Check if user is a member of the category's household
-        if self.request.user not in category.household.members.all():
-            raise PermissionError(
-                'You do not have permission to access this category.'
-            )
-
-        return category
+        return ExpenseCategory.objects.select_related('household')
 
     def perform_update(self, serializer):
         """Additional validation for updates."""
-        category = self.get_object()
+        category = serializer.instance
 
         # Only allow household owner to update categories
         if self.request.user != category.household.owner:
-            raise PermissionError(
+            raise PermissionDenied(
                 'You do not have permission to update this category.'
             )
 
@@ -108,7 +91,7 @@ class ExpenseCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
         """Additional validation for deletion."""
         # Only allow household owner to delete categories
         if self.request.user != instance.household.owner:
-            raise PermissionError(
+            raise PermissionDenied(
                 'You do not have permission to delete this category.'
             )
 
@@ -117,29 +100,21 @@ class ExpenseCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 @extend_schema(tags=['5. Expense Categories'])
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
 def household_categories(request, household_id):
     """
     Get all expense categories for a specific household.
     """
-    user = request.user
-
-    # Check if user is a member of the household
-    try:
-        household = Household.objects.get(
-            id=household_id,
-            members=user
-        )
-    except Household.DoesNotExist:
-        return Response(
-            {'error': 'Household not found or you do not have access'},
-            status=status.HTTP_404_NOT_FOUND
-        )
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
 
     # Get all categories for this household
     categories = ExpenseCategory.objects.filter(
         household=household
     ).order_by('name')
 
-    serializer = ExpenseCategoryListSerializer(categories, many=True)
+    serializer = ExpenseCategoryListValuesSerializer(
+        ExpenseCategoryListValuesSerializer.values(categories),
+        context={'request': request}
+    )
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,187 @@
+import csv
+import json
+from decimal import Decimal
+from itertools import groupby
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.decorators import (
+    api_view, permission_classes, renderer_classes
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+
+from algorithms.splits import rule_splits
+from ..models import Expense, Household, User
+from ..permissions import IsHouseholdMember
+from ..renderers import CSVRenderer, NDJSONRenderer
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPENSE_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'amount': 'amount',
+    'created_at': 'created_at',
+    'author_id': 'author_id',
+    'payer_id': 'payer_id',
+    'payer_username': 'payer__username',
+    'category_id': 'category_id',
+    'category_name': 'category__name',
+    'unsettled_amount': 'unsettled_amount',
+    'is_fully_settled': 'is_fully_settled',
+}
+
+SPLIT_FIELDS = {
+    'split_user_id': 'splits__user_id',
+    'split_username': 'splits__user__username',
+    'split_amount': 'splits__amount',
+    'split_is_settled': 'splits__is_settled',
+}
+
+# Needed to expand rule-based expenses, not exported themselves.
+RULE_FIELDS = {
+    'split_type': 'split_type',
+    'split_shares': 'split_shares',
+}
+
+
+class Echo:
+    """File-like object that returns what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    """Format amounts as exact strings and datetimes as ISO 8601."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def expand_split_rule(rows, usernames):
+    """
+    Replace the stored exception rows of a rule-based expense with one row
+    per effective split.
+    """
+    expense = {field: rows[0][field] for field in EXPENSE_FIELDS}
+    materialized = {row['split_user_id']: row['split_is_settled']
+                    for row in rows if row['split_user_id'] is not None}
+    splits = rule_splits(
+        expense['id'], expense['payer_id'], expense['amount'],
+        rows[0]['split_shares'] or {}, materialized
+    )
+
+    missing = {split.user_id for split in splits} - set(usernames)
+    if missing:
+        usernames.update(User.objects.filter(
+            id__in=missing
+        ).values_list('id', 'username'))
+
+    return [
+        {
+            **expense,
+            'split_user_id': split.user_id,
+            'split_username': usernames.get(split.user_id),
+            'split_amount': split.amount,
+            'split_is_settled': split.is_settled,
+        }
+        for split in splits
+    ]
+
+
+def export_rows(household):
+    """
+    Yield one flat dict per split, or per expense without splits, in
+    creation order. The splits are LEFT JOINed in the same query and the
+    rows are fetched in chunks, so memory use does not depend on history
+    length. Rule-based expenses are expanded into their effective splits.
+    """
+    lookups = {**EXPENSE_FIELDS, **SPLIT_FIELDS, **RULE_FIELDS}
+    rows = Expense.objects.filter(
+        household=household
+    ).order_by('created_at', 'id', 'splits__id').values_list(
+        *lookups.values()
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    columns = list(lookups)
+    output_columns = list(EXPENSE_FIELDS) + list(SPLIT_FIELDS)
+    usernames = dict(household.members.values_list('id', 'username'))
+
+    records = (dict(zip(columns, row)) for row in rows)
+    for _, group in groupby(records, key=lambda record: record['id']):
+        group = list(group)
+        if group[0]['split_type'] != Expense.SPLIT_EXPLICIT:
+            group = expand_split_rule(group, usernames)
+
+        for record in group:
+            yield {column: export_value(record[column])
+                   for column in output_columns}
+
+
+def stream_csv(household):
+    writer = csv.writer(Echo())
+    columns = list(EXPENSE_FIELDS) + list(SPLIT_FIELDS)
+    yield writer.writerow(columns)
+    for row in export_rows(household):
+        yield writer.writerow(row.values())
+
+
+def stream_ndjson(household):
+    for _, rows in groupby(export_rows(household), key=lambda row: row['id']):
+        rows = list(rows)
+        expense = {field: rows[0][field] for field in EXPENSE_FIELDS}
+        expense['splits'] = [
+            {
+                'user_id': row['split_user_id'],
+                'username': row['split_username'],
+                'amount': row['split_amount'],
+                'is_settled': row['split_is_settled'],
+            }
+            for row in rows if row['split_user_id'] is not None
+        ]
+        yield json.dumps(expense) + '\n'
+
+
+@extend_schema(
+    tags=['6. Expenses'],
+    parameters=[
+        OpenApiParameter(
+            'format', str, enum=['csv', 'ndjson'],
+            description='Export format, CSV has one row per split and '
+                        'NDJSON one line per expense'),
+    ],
+    responses={(200, 'text/csv'): str, (200, 'application/x-ndjson'): str},
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+@renderer_classes([CSVRenderer, NDJSONRenderer, JSONRenderer])
+def household_expense_export(request, household_id):
+    """
+    Stream every expense of a household together with its splits.
+    """
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
+
+    if request.accepted_renderer.format == 'ndjson':
+        response = StreamingHttpResponse(
+            stream_ndjson(household),
+            content_type='application/x-ndjson'
+        )
+        extension = 'ndjson'
+    else:
+        response = StreamingHttpResponse(
+            stream_csv(household),
+            content_type='text/csv'
+        )
+        extension = 'csv'
+
+    response['Content-Disposition'] = (
+        f'attachment; filename="household-{household_id}-expenses.{extension}"'
+    )
+    return response
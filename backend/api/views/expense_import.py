@@ -0,0 +1,271 @@
+import csv
+import io
+import json
+
+from django.db import DatabaseError, transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import (
+    Expense, ExpenseCategory, ExpenseSplit, Household, HouseholdChange
+)
+from ..permissions import IsHouseholdMember
+from ..serializers import ExpenseImportRowSerializer
+
+MAX_IMPORT_ROWS = 10000
+IMPORT_BATCH_SIZE = 500
+
+
+def parse_csv_splits(value):
+    """
+    Parse a CSV ``splits`` cell such as ``"2:15.00;3:15.00"`` into split
+    dicts. Malformed entries are passed through for the serializer to reject.
+    """
+    splits = []
+    for entry in filter(None, (part.strip() for part in value.split(';'))):
+        user_id, _, amount = entry.partition(':')
+        splits.append({'user_id': user_id.strip(),
+                       'amount': amount.strip() or None})
+    return splits
+
+
+def read_csv_rows(text):
+    """
+    Read import rows from CSV with a header row of name, description, amount,
+    payer_id, category_id and splits columns.
+    """
+    rows = []
+    for record in csv.DictReader(io.StringIO(text)):
+        row = {key.strip(): value for key, value in record.items()
+               if key and value not in (None, '')}
+        if 'splits' in row:
+            row['splits_data'] = parse_csv_splits(row.pop('splits'))
+        rows.append(row)
+    return rows
+
+
+def read_import_rows(request):
+    """Return the list of import rows from a JSON or CSV request body."""
+    if request.content_type.startswith('text/csv'):
+        return read_csv_rows(request.body.decode('utf-8-sig'))
+
+    if 'file' in request.FILES:
+        return read_csv_rows(request.FILES['file'].read().decode('utf-8-sig'))
+
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get('expenses')
+    if not isinstance(data, list):
+        raise ValueError('Expected a list of expenses')
+    return data
+
+
+def insert_expenses(household, author, rows):
+    """
+    Insert validated rows in batches and yield the number of expenses
+    inserted so far after each batch.
+
+    The denormalized settlement fields are computed here rather than with a
+    follow-up UPDATE, the payer's own split is settled as in
+    ``ExpenseSerializer.create``.
+    """
+    inserted = 0
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+
+        expenses = []
+        for row in batch:
+            splits_data = row.get('splits_data') or []
+            unsettled = [split['amount'] for split in splits_data
+                         if split['user_id'] != row['payer_id']]
+            expenses.append(Expense(
+                household=household,
+                author=author,
+                name=row['name'],
+                description=row.get('description'),
+                amount=row['amount'],
+                payer_id=row['payer_id'],
+                category_id=row.get('category_id'),
+                unsettled_amount=sum(unsettled),
+                is_fully_settled=not unsettled
+            ))
+        Expense.objects.bulk_create(expenses)
+
+        splits = [
+            ExpenseSplit(
+                expense=expense,
+                user_id=split['user_id'],
+                amount=split['amount'],
+                is_settled=split['user_id'] == row['payer_id']
+            )
+            for expense, row in zip(expenses, batch)
+            for split in row.get('splits_data') or []
+        ]
+        ExpenseSplit.objects.bulk_create(splits, batch_size=IMPORT_BATCH_SIZE)
+        # Bulk inserts bypass the signals that track changes
+        HouseholdChange.objects.record(
+            household.pk, HouseholdChange.EXPENSE,
+            [expense.pk for expense in expenses])
+
+        inserted += len(batch)
+        yield inserted, [expense.pk for expense in expenses]
+
+
+def stream_import(household, author, rows):
+    """
+    Insert the rows and yield an NDJSON progress line after each batch.
+
+    The response has been sent by the time the batches run, so no
+    transaction may stay open while the client reads: each batch is
+    committed on its own. If one fails the last line reports the error and
+    how many expenses were imported before it, instead of a ``household_id``
+    line.
+    """
+    total = len(rows)
+    inserted = 0
+    batches = insert_expenses(household, author, rows)
+    while True:
+        try:
+            with transaction.atomic():
+                inserted, _ = next(batches)
+        except StopIteration:
+            break
+        except DatabaseError as e:
+            yield json.dumps({
+                'error': f'Import stopped: {str(e)}',
+                'created': inserted,
+                'total': total,
+            }) + '\n'
+            return
+        yield json.dumps({'inserted': inserted, 'total': total}) + '\n'
+    yield json.dumps({'household_id': household.pk, 'created': total}) + '\n'
+
+
+@extend_schema(
+    tags=['6. Expenses'],
+    parameters=[
+        OpenApiParameter(
+            'stream', bool,
+            description='Stream NDJSON progress lines while inserting, '
+                        'committing each batch'),
+    ],
+    request={
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'expenses': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'name': {'type': 'string'},
+                            'description': {'type': 'string'},
+                            'amount': {'type': 'string'},
+                            'payer_id': {'type': 'integer'},
+                            'category_id': {'type': 'integer'},
+                            'splits_data': {
+                                'type': 'array',
+                                'items': {
+                                    'type': 'object',
+                                    'properties': {
+                                        'user_id': {'type': 'integer'},
+                                        'amount': {'type': 'string'},
+                                    },
+                                },
+                            },
+                            'split_spec': {
+                                'type': 'object',
+                                'description': 'Instead of splits_data, '
+                                               'e.g. {"type": "equal", '
+                                               '"users": [1, 2]}',
+                            },
+                        },
+                        'required': ['name', 'amount', 'payer_id'],
+                    },
+                },
+            },
+        },
+        'text/csv': {
+            'type': 'string',
+            'description': 'Header row: name,description,amount,payer_id,'
+                           'category_id,splits where splits is '
+                           '"user_id:amount;user_id:amount"',
+        },
+    },
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+def household_expense_import(request, household_id):
+    """
+    Import many expenses into a household at once from JSON or CSV.
+    Every row is validated first, nothing is inserted if any row is invalid.
+    A streamed import commits batch by batch, see ``stream_import``.
+    """
+    user = request.user
+
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
+
+    try:
+        rows = read_import_rows(request)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return Response(
+            {'error': f'Could not read expenses: {str(e)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not rows:
+        return Response(
+            {'error': 'No expenses to import'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(rows) > MAX_IMPORT_ROWS:
+        return Response(
+            {'error': f'Cannot import more than {MAX_IMPORT_ROWS} '
+                      'expenses at once'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    serializer = ExpenseImportRowSerializer(data=rows, many=True, context={
+        'member_ids': set(household.members.values_list('id', flat=True)),
+        'category_ids': set(ExpenseCategory.objects.filter(
+            household=household
+        ).values_list('id', flat=True)),
+    })
+    if not serializer.is_valid():
+        return Response(
+            {
+                'error': 'Some expenses are invalid, nothing was imported',
+                'errors': [
+                    {'row': index, 'errors': errors}
+                    for index, errors in enumerate(serializer.errors)
+                    if errors
+                ],
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    validated_rows = serializer.validated_data
+    if request.query_params.get('stream', '').lower() == 'true':
+        return StreamingHttpResponse(
+            stream_import(household, user, validated_rows),
+            content_type='application/x-ndjson',
+            status=status.HTTP_201_CREATED
+        )
+
+    expense_ids = []
+    with transaction.atomic():
+        for _, batch_ids in insert_expenses(household, user, validated_rows):
+            expense_ids.extend(batch_ids)
+
+    return Response({
+        'household_id': household_id,
+        'created': len(expense_ids),
+        'expense_ids': expense_ids,
+    }, status=status.HTTP_201_CREATED)
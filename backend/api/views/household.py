@@ -1,19 +1,41 @@
-from drf_spectacular.utils import extend_schema
+from django.utils.decorators import method_decorator
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
 from ..models import Household, Membership
-from ..serializers import HouseholdSerializer
+from ..pagination import KeysetPagination
+from ..permissions import IsHouseholdMember
+from ..serializers import HouseholdSerializer, HouseholdMemberSerializer
+from ..serializers.mixins import parse_list_param
+from ..versions import versioned_household_get
 
+EXPAND_PARAMETERS = [
+    OpenApiParameter(
+        'expand', str,
+        description='Comma separated list of related objects to include, '
+                    'e.g. tasks'),
+]
 
-@extend_schema(tags=['3. Households'])
-class HouseholdListCreateView(generics.ListCreateAPIView):
+
+class HouseholdQuerysetMixin:
+    def get_queryset(self):  # type: ignore
+        return HouseholdSerializer.optimize_queryset(
+            super().get_queryset(),  # type: ignore
+            expand=parse_list_param(
+                self.request.query_params.get('expand'))  # type: ignore
+        )
+
+
+@extend_schema(tags=['3. Households'], parameters=EXPAND_PARAMETERS)
+class HouseholdListCreateView(HouseholdQuerysetMixin,
+                              generics.ListCreateAPIView):
     queryset = Household.objects.all()
     serializer_class = HouseholdSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):  # type: ignore
-        return Household.objects.filter(
+        return super().get_queryset().filter(
             members=self.request.user
         ).order_by('name')
 
@@ -26,16 +48,24 @@ class HouseholdListCreateView(generics.ListCreateAPIView):
         )
 
 
-@extend_schema(tags=['3. Households'])
-class HouseholdDetailView(generics.RetrieveUpdateDestroyAPIView):
+@extend_schema(tags=['3. Households'], parameters=EXPAND_PARAMETERS)
+@method_decorator(versioned_household_get('pk'), name='get')
+class HouseholdDetailView(HouseholdQuerysetMixin,
+                          generics.RetrieveUpdateDestroyAPIView):
     queryset = Household.objects.all()
     serializer_class = HouseholdSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsHouseholdMember]
+
 
-    def get_object(self):  # type: ignore
-        household = super().get_object()
-        if self.request.user not in household.members.all():
-            raise PermissionError(
-                'You do not have permission to access this household.'
-            )
-        return household
+@extend_schema(tags=['3. Households'])
+class HouseholdMemberListView(generics.ListAPIView):
+    """List the members of a household, paginated"""
+    serializer_class = HouseholdMemberSerializer
+    permission_classes = [IsAuthenticated, IsHouseholdMember]
+    pagination_class = KeysetPagination
+    pagination_ordering = ('id',)
+
+    def get_queryset(self):  # type: ignore
+        return Membership.objects.filter(
+            household_id=self.kwargs.get('household_id')
+        ).select_related('user').order_by('id')
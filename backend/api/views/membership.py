@@ -1,5 +1,6 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 
 from ..models import Membership
@@ -37,7 +38,7 @@ class MembershipDetailView(generics.RetrieveUpdateDestroyAPIView):
         membership = super().get_object()
         if membership.user != self.request.user \
                 and membership.household.owner != self.request.user:
-            raise PermissionError(
+            raise PermissionDenied(
                 'You do not have permission to access this membership.'
             )
         return membership
@@ -0,0 +1,84 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.response import Response
+
+NORMALIZE_PARAMETERS = [
+    OpenApiParameter(
+        'normalize', str,
+        description='Set to users to render nested users as their id and '
+                    'list each user once in a users side table'),
+]
+
+
+class ValuesListMixin:
+    """
+    Serves list requests through ``values_serializer_class``, a
+    ``ValuesSerializer`` that reproduces the output of the view's read
+    serializer from ``.values()`` rows.
+
+    Normalized responses (``?normalize=users``) are always wrapped as
+    ``{"results": [...], "users": [...]}``, paginated or not.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore
+        # The pagination key must be part of the rows for the cursors
+        ordering = getattr(self, 'pagination_ordering', ())
+        rows = self.values_serializer_class.values(  # type: ignore
+            queryset, *(field.lstrip('-') for field in ordering))
+
+        page = self.paginate_queryset(rows)  # type: ignore
+        serializer = self.values_serializer_class(  # type: ignore
+            rows if page is None else page,
+            context=self.get_serializer_context()  # type: ignore
+        )
+        data = serializer.data
+
+        if page is not None:
+            response = self.get_paginated_response(data)  # type: ignore
+        elif serializer.normalize:
+            response = Response({'results': data})
+        else:
+            return Response(data)
+
+        if serializer.normalize:
+            response.data['users'] = serializer.users
+        return response
+
+
+class AsyncDispatchMixin:
+    """
+    Lets an ``APIView`` declare its handlers with ``async def``, which
+    Django then serves as an async view. Authentication, permissions and
+    throttles run as usual, on a worker thread as they may query the
+    database, and sync handlers such as ``options`` likewise.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(  # type: ignore
+            request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers  # type: ignore
+
+        try:
+            await sync_to_async(self.initial)(  # type: ignore
+                request, *args, **kwargs)
+
+            method = request.method.lower()
+            if method in self.http_method_names:  # type: ignore
+                handler = getattr(self, method,
+                                  self.http_method_not_allowed)  # type: ignore
+            else:
+                handler = self.http_method_not_allowed  # type: ignore
+            if not iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)  # type: ignore
+
+        self.response = self.finalize_response(  # type: ignore
+            request, response, *args, **kwargs)
+        return self.response
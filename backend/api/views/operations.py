@@ -0,0 +1,23 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..cache import response_cache_stats
+from ..throttling import throttle_stats as get_throttle_stats
+
+
+@extend_schema(tags=['10. Operations'])
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit rate of the household response cache"""
+    return Response(response_cache_stats())
+
+
+@extend_schema(tags=['10. Operations'])
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def throttle_stats(request):
+    """Requests admitted and throttled on the expensive endpoints"""
+    return Response(get_throttle_stats())
@@ -1,43 +1,43 @@
 from decimal import Decimal
 from django.db import transaction
 from django.db.models import Sum, Q
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from api.idempotency import IDEMPOTENCY_PARAMETERS, idempotent
 from api.models import Household, Expense, ExpenseSplit, User
+from api.permissions import IsHouseholdMember
+from api.throttling import admit_computation
+from api.versions import versioned_household_get
 from algorithms.settlements import optimal_settlements, Transaction
-from algorithms.statistics import calculate_user_net_balance
+from algorithms.statistics import (
+    calculate_user_net_balance, load_effective_splits
+)
 
 
 @extend_schema(tags=['9. Settlements'])
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+@versioned_household_get()
+@admit_computation
 def household_balances(request, household_id):
     """
     Get user balances for a specific household.
     """
-    user = request.user
-
-    # Check if user is a member of the household
-    try:
-        household = Household.objects.get(
-            id=household_id,
-            members=user
-        )
-    except Household.DoesNotExist:
-        return Response(
-            {'error': 'Household not found or you do not have access'},
-            status=status.HTTP_404_NOT_FOUND
-        )
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
 
     # Calculate balances for each member
     balances = {}
 
+    splits = load_effective_splits(household=household)
     for member in household.members.all():
-        balance = calculate_user_net_balance(member, household)
+        balance = calculate_user_net_balance(member, household, splits)
         balances[member.id] = float(balance)
 
     return Response({
@@ -56,30 +56,22 @@ def household_balances(request, household_id):
 
 @extend_schema(tags=['9. Settlements'])
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+@versioned_household_get()
+@admit_computation
 def household_settlement_plan(request, household_id):
     """
     Get optimal settlement plan for a specific household.
     """
-    user = request.user
-
-    # Check if user is a member of the household
-    try:
-        household = Household.objects.get(
-            id=household_id,
-            members=user
-        )
-    except Household.DoesNotExist:
-        return Response(
-            {'error': 'Household not found or you do not have access'},
-            status=status.HTTP_404_NOT_FOUND
-        )
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
 
     # Calculate balances (same logic as above)
     balances = {}
 
+    splits = load_effective_splits(household=household)
     for member in household.members.all():
-        balance = calculate_user_net_balance(member, household)
+        balance = calculate_user_net_balance(member, household, splits)
         balances[member.id] = float(balance)
 
     try:
@@ -114,8 +106,48 @@ def household_settlement_plan(request, household_id):
         )
 
 
+def settle_splits_between(household, payer, payee):
+    """
+    Settle every open split the two users owe each other in the household,
+    including the shares of rule-based expenses, and return how many were
+    settled.
+    """
+    settled_count_1 = ExpenseSplit.objects.filter(
+        expense__household=household,
+        user=payer,
+        is_settled=False,
+        expense__payer=payee
+    ).update(is_settled=True, updated_at=timezone.now())
+    settled_count_2 = ExpenseSplit.objects.filter(
+        expense__household=household,
+        user=payee,
+        is_settled=False,
+        expense__payer=payer
+    ).update(is_settled=True, updated_at=timezone.now())
+    # Shares of rule-based expenses have no rows to update
+    settled_count_3 = Expense.objects.filter(
+        household=household,
+        payer=payee
+    ).settle_rule_splits(payer)
+    settled_count_4 = Expense.objects.filter(
+        household=household,
+        payer=payer
+    ).settle_rule_splits(payee)
+
+    # Bulk updates bypass ExpenseSplit.save
+    Expense.objects.filter(
+        household=household,
+        payer__in=[payer, payee],
+        is_fully_settled=False
+    ).refresh_settlement_state()
+
+    return (settled_count_1 + settled_count_2
+            + settled_count_3 + settled_count_4)
+
+
 @extend_schema(
     tags=['9. Settlements'],
+    parameters=IDEMPOTENCY_PARAMETERS,
     request={
         'application/json': {
             'type': 'object',
@@ -145,7 +177,8 @@ def household_settlement_plan(request, household_id):
     },
 )
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsHouseholdMember])
+@idempotent
 def process_settlement(request, household_id):
     """
     Process a settlement payment between two household members.
@@ -154,19 +187,8 @@ def process_settlement(request, household_id):
     2) Less than optimal -> create compensating expense
     3) More than optimal -> settle all splits + create compensating expense
     """
-    user = request.user
-
-    # Check if user is a member of the household
-    try:
-        household = Household.objects.get(
-            id=household_id,
-            members=user
-        )
-    except Household.DoesNotExist:
-        return Response(
-            {'error': 'Household not found or you do not have access'},
-            status=status.HTTP_404_NOT_FOUND
-        )
+    # Membership is checked by IsHouseholdMember
+    household = get_object_or_404(Household, id=household_id)
 
     payer_id = request.data.get('payer_id')
     payee_id = request.data.get('payee_id')
@@ -206,8 +228,9 @@ def process_settlement(request, household_id):
 
     # Calculate current balances
     balances = {}
+    splits = load_effective_splits(household=household)
     for member in household.members.all():
-        balance = calculate_user_net_balance(member, household)
+        balance = calculate_user_net_balance(member, household, splits)
         balances[member.id] = balance
 
     try:
@@ -239,23 +262,8 @@ def process_settlement(request, household_id):
             if abs(amount - optimal_amount) <= tolerance:
                 # Case 1: Exact optimal payment
                 # Settle all unsettled splits between these two users
-                settled_splits_1 = ExpenseSplit.objects.filter(
-                    expense__household=household,
-                    user=payer,
-                    is_settled=False,
-                    expense__payer=payee
-                )
-
-                settled_splits_2 = ExpenseSplit.objects.filter(
-                    expense__household=household,
-                    user=payee,
-                    is_settled=False,
-                    expense__payer=payer
-                )
-
-                settled_count_1 = settled_splits_1.update(is_settled=True)
-                settled_count_2 = settled_splits_2.update(is_settled=True)
-                total_settled = settled_count_1 + settled_count_2
+                total_settled = settle_splits_between(
+                    household, payer, payee)
 
                 result['case'] = 1
                 result['actions_taken'].append(
@@ -292,23 +300,8 @@ def process_settlement(request, household_id):
                 excess = amount - optimal_amount
 
                 # First, settle all splits between these users (like Case 1)
-                settled_splits_1 = ExpenseSplit.objects.filter(
-                    expense__household=household,
-                    user=payer,
-                    is_settled=False,
-                    expense__payer=payee
-                )
-
-                settled_splits_2 = ExpenseSplit.objects.filter(
-                    expense__household=household,
-                    user=payee,
-                    is_settled=False,
-                    expense__payer=payer
-                )
-
-                settled_count_1 = settled_splits_1.update(is_settled=True)
-                settled_count_2 = settled_splits_2.update(is_settled=True)
-                total_settled = settled_count_1 + settled_count_2
+                total_settled = settle_splits_between(
+                    household, payer, payee)
 
                 compensating_expense = Expense.objects.create(
                     name='<<<SETTLEMENT ADJUSTMENT>>>',
@@ -1,10 +1,15 @@
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 
 from ..models import ShoppingListItem, Household
-from ..serializers import ShoppingListItemSerializer
+from ..permissions import IsHouseholdMember
+from ..serializers import (
+    ShoppingListItemSerializer, ShoppingListItemValuesSerializer
+)
+from .mixins import NORMALIZE_PARAMETERS, ValuesListMixin
+from ..versions import versioned_household_get
 
 
 @extend_schema(
@@ -18,31 +23,25 @@ from ..serializers import ShoppingListItemSerializer
         )
     ]
 )
-class ShoppingListItemListCreateView(generics.ListCreateAPIView):
-    permission_classes = [permissions.IsAuthenticated]
+class ShoppingListItemListCreateView(ValuesListMixin,
+                                     generics.ListCreateAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsHouseholdMember]
     serializer_class = ShoppingListItemSerializer
+    values_serializer_class = ShoppingListItemValuesSerializer
 
     def get_queryset(self):  # type: ignore
-        household_id = self.kwargs.get('household_id')
-        household = get_object_or_404(Household, id=household_id)
+        return ShoppingListItem.objects.filter(
+            household_id=self.kwargs.get('household_id')
+        ).order_by('-added_at')
 
-        # Check if user is member or owner of household
-        if not (household.owner == self.request.user or
-                self.request.user in household.members.all()):
-            return ShoppingListItem.objects.none()
-
-        return ShoppingListItem.objects.filter(household=household).order_by('-added_at')
+    @extend_schema(parameters=NORMALIZE_PARAMETERS)
+    @method_decorator(versioned_household_get())
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         household_id = self.kwargs.get('household_id')
         household = get_object_or_404(Household, id=household_id)
-
-        if not (household.owner == self.request.user or
-                self.request.user in household.members.all()):
-            raise PermissionDenied(
-                "You don't have permission to add items to this household's shopping list"
-            )
-
         serializer.save(
             added_by=self.request.user,
             household=household
@@ -51,19 +50,8 @@ class ShoppingListItemListCreateView(generics.ListCreateAPIView):
 
 @extend_schema(tags=['8. Shopping List Items'])
 class ShoppingListItemDetailView(generics.RetrieveUpdateDestroyAPIView):
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsHouseholdMember]
     serializer_class = ShoppingListItemSerializer
 
     def get_queryset(self):  # type: ignore
         return ShoppingListItem.objects.all()
-
-    def get_object(self):
-        item = super().get_object()
-
-        # Check if user is a member of the item's household
-        if self.request.user not in item.household.members.all():
-            raise PermissionDenied(
-                'You do not have permission to access this shopping list item.'
-            )
-
-        return item
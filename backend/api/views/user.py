@@ -1,3 +1,4 @@
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -23,4 +24,6 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):  # type: ignore
-        return self.request.user
+        # The user of a read request is built from token claims, which can
+        # predate the last profile change
+        return get_object_or_404(self.get_queryset(), pk=self.request.user.pk)
@@ -31,14 +31,88 @@ ALLOWED_HOSTS = []
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Rendered household-scoped GET responses, see api.cache. Any backend
+# works, e.g. django.core.cache.backends.filebased.FileBasedCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 600
+
+# Per-user household id sets, see api.permissions.IsHouseholdMember
+MEMBERSHIP_CACHE_ALIAS = 'default'
+MEMBERSHIP_CACHE_TIMEOUT = 60
+
+# Per-process LRU of authenticated users, see api.authentication
+USER_CACHE_SIZE = 256
+USER_CACHE_TIMEOUT = 60
+
+# Change log entries per delta sync response, see api.views.changes
+CHANGES_PAGE_SIZE = 500
+
+# Live change events, see api.events. ChangeLogBackend also reaches clients
+# connected to other worker processes.
+EVENTS_BACKEND = 'api.events.InProcessBackend'
+EVENTS_QUEUE_SIZE = 100
+EVENTS_KEEPALIVE = 15
+EVENTS_POLL_INTERVAL = 1
+
+# Most requests one POST /api/batch/ may carry, see api.views.batch
+BATCH_MAX_REQUESTS = 20
+
+# Seconds a response is replayed for a repeated Idempotency-Key, see
+# api.idempotency
+IDEMPOTENCY_KEY_TIMEOUT = 24 * 60 * 60
+
+# Threads running the independent queries of summary endpoints
+# concurrently, see api.aggregates. 0 runs them one after another on the
+# request's connection. The summaries mostly spend their time expanding
+# splits in Python, which threads do not overlap, so the pool only pays
+# off with the round trips to a database server. Measure with
+# manage.py benchmark_summaries --latency.
+AGGREGATE_WORKERS = 0
+
+# Cost-weighted token buckets of the expensive endpoints, see
+# api.throttling. A bucket holds up to capacity tokens and regains
+# refill_rate tokens a second, a request spends the cost of its view, 1 if
+# not listed. Costs must not exceed the capacities.
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_BUCKETS = {
+    'user': {'capacity': 60, 'refill_rate': 1},
+    'household': {'capacity': 120, 'refill_rate': 2},
+}
+THROTTLE_COSTS = {
+    'household_settlement_plan': 10,
+    'household_balances': 5,
+    'HouseholdExpenseSummaryView': 5,
+    'UserExpenseSummaryView': 5,
+}
+
+# Expensive computations running at once before further requests get 429,
+# see api.throttling.admit_computation
+COMPUTATION_CONCURRENCY = 8
+COMPUTATION_TIMEOUT = 60
+COMPUTATION_RETRY_AFTER = 1
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -53,7 +127,7 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '0.0.1',
     'SERVE_INCLUDE_SCHEMA': False,
     'AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'SWAGGER_UI_SETTINGS': {
         'persistAuthorization': True,
@@ -131,6 +205,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -9,7 +9,7 @@ import {
   SplitMember
 } from '../types';
 import { expenseAPI } from '../services/api';
-import { calculateSplitsForAPI } from '../utils/splitCalculations';
+import { buildSplitSpec, calculateSplitsForAPI } from '../utils/splitCalculations';
 import Button from './Button';
 import Input from './Input';
 import { CategorySelect, UserSelect } from './CustomSelects';
@@ -112,7 +112,10 @@ const AddExpense: React.FC<AddExpenseProps> = ({
 
     try {
       const amount = parseFloat(formData.amount);
-      const splits_data = calculateSplitsForAPI(splitConfiguration, amount);
+      const split_spec = buildSplitSpec(splitConfiguration);
+      const splits = split_spec
+        ? { split_spec }
+        : { splits_data: calculateSplitsForAPI(splitConfiguration, amount) };
 
       if (isEditing && editExpense) {
         // Update existing expense
@@ -121,7 +124,7 @@ const AddExpense: React.FC<AddExpenseProps> = ({
           description: formData.description,
           amount: formData.amount,
           payer_id: formData.payer_id,
-          splits_data,
+          ...splits,
           ...(formData.category_id > 0 ? { category_id: formData.category_id } : { category_id: null })
         };
 
@@ -134,7 +137,7 @@ const AddExpense: React.FC<AddExpenseProps> = ({
           description: formData.description,
           amount: formData.amount,
           payer_id: formData.payer_id,
-          splits_data,
+          ...splits,
           ...(formData.category_id > 0 && { category_id: formData.category_id })
         };
 
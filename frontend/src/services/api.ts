@@ -9,6 +9,7 @@ import {
   Expense,
   CreateExpenseData,
   CreateExpenseSplit,
+  SplitSpec,
   ExpenseCategory,
   Task,
   CreateTaskData,
@@ -19,7 +20,8 @@ import {
   HouseholdBalances,
   SettlementPlan,
   ProcessSettlementData,
-  ProcessSettlementResult
+  ProcessSettlementResult,
+  Paginated
 } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000/api';
@@ -212,8 +214,14 @@ export const membershipAPI = {
 
 export const expenseAPI = {
   getExpenses: async (householdId: number): Promise<Expense[]> => {
-    const response = await api.get(`/expenses/?household_id=${householdId}`);
-    const expenses = response.data;
+    const expenses: Expense[] = [];
+    let url: string | null = `/expenses/?household_id=${householdId}`;
+
+    while (url) {
+      const response: { data: Paginated<Expense> } = await api.get(url);
+      expenses.push(...response.data.results);
+      url = response.data.next;
+    }
 
     const expensesWithSplits = await Promise.all(
       expenses.map(async (expense: Expense) => {
@@ -243,6 +251,7 @@ export const expenseAPI = {
       amount?: string;
       payer_id?: number;
       splits_data?: CreateExpenseSplit[];
+      split_spec?: SplitSpec;
     }
   ): Promise<Expense> => {
     const response = await api.patch(`/expenses/${expenseId}/`, data);
@@ -80,11 +80,22 @@ export interface Expense {
   updated_at: string;
 }
 
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export interface CreateExpenseSplit {
   user_id: number;
   amount: string;
 }
 
+export type SplitSpec =
+  | { type: 'equal'; users: number[] }
+  | { type: 'shares'; shares: { [userId: number]: number } }
+  | { type: 'percent'; percents: { [userId: number]: number } };
+
 export interface CreateExpenseData {
   household_id: number;
   category_id?: number;
@@ -92,7 +103,8 @@ export interface CreateExpenseData {
   description: string;
   amount: string;
   payer_id: number;
-  splits_data: CreateExpenseSplit[];
+  splits_data?: CreateExpenseSplit[];
+  split_spec?: SplitSpec;
 }
 
 export type SplitType = 'equal' | 'percentage' | 'fixed' | 'parts' | 'plus_minus';
@@ -1,4 +1,4 @@
-import { SplitConfiguration, SplitMember } from '../types';
+import { SplitConfiguration, SplitMember, SplitSpec } from '../types';
 
 export interface SplitResult {
   user_id: number;
@@ -105,6 +105,23 @@ export const calculateSplitsForAPI = (
     }));
 };
 
+// Split types the API allocates itself, in exact cents
+export const buildSplitSpec = (config: SplitConfiguration): SplitSpec | null => {
+  const values = (): { [userId: number]: number } =>
+    Object.fromEntries(config.members.map(member => [member.user_id, member.value || 0]));
+
+  switch (config.type) {
+    case 'equal':
+      return { type: 'equal', users: config.members.map(member => member.user_id) };
+    case 'percentage':
+      return { type: 'percent', percents: values() };
+    case 'parts':
+      return { type: 'shares', shares: values() };
+    default:
+      return null;
+  }
+};
+
 const hasNegativeValues = (members: SplitMember[]): boolean =>
   members.some(member => (member.value || 0) < 0);
 